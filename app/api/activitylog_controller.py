@@ -1,18 +1,27 @@
-from flask import Blueprint, jsonify, g
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 from app.utils.uc_provider import provide_activitylog_uc
-from app.utils.auth_middleware import require_auth, require_permission
+from app.utils.auth_middleware import require_permission
 
 log_bp = Blueprint("log_bp", __name__, url_prefix="/api/activity-logs")
 
 @log_bp.route("/", methods=["GET"])
-@require_auth
+@require_permission("USER_MANAGE")
 def get_all_logs():
     uc = provide_activitylog_uc()
 
-    if "USER_MANAGE" not in g.current_permissions:
-        return jsonify({"error": "Permission denied"}), 403
+    filters = uc.parse_filters(request.args)
+    page = uc.list_logs(filters, request.args.get("cursor"), request.args.get("limit"))
+    return jsonify(page), 200
 
-    logs = uc.get_all_logs()
-    return jsonify(logs), 200
 
+@log_bp.route("/export", methods=["GET"])
+@require_permission("USER_MANAGE")
+def export_logs():
+    uc = provide_activitylog_uc()
 
+    filters = uc.parse_filters(request.args)
+    return Response(
+        stream_with_context(uc.export_ndjson(filters)),
+        mimetype="application/x-ndjson",
+        headers={"Content-Disposition": "attachment; filename=activity_logs.ndjson"}
+    )
@@ -66,7 +66,13 @@ def refresh():
             return jsonify({"error": "User invalid"}), 403
 
         permissions = user.permission_codes
-        new_access_token = create_access_token(user.id, user.username, permissions)
+        new_access_token = create_access_token(
+            user.id,
+            user.username,
+            permissions,
+            role_id=user.role_id,
+            permissions_version=user.permissions_version,
+        )
         new_refresh_token = create_refresh_token(user.id)  # THÊM DÒNG NÀY
 
         resp = jsonify({
@@ -0,0 +1,11 @@
+from flask import Blueprint, jsonify
+from app.utils.auth_middleware import require_permission
+from app.utils.mail_queue import mail_queue
+
+mail_bp = Blueprint("mail_bp", __name__, url_prefix="/api/mail")
+
+
+@mail_bp.route("/metrics", methods=["GET"])
+@require_permission("USER_MANAGE")
+def get_mail_metrics():
+    return jsonify(mail_queue.metrics()), 200
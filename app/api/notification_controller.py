@@ -1,6 +1,7 @@
-from flask import Blueprint, request, jsonify, g
+from flask import Blueprint, Response, current_app, request, jsonify, g
 from app.utils.auth_middleware import require_auth
 from app.usecase.notification_uc import NotificationUC
+from app.utils.notification_hub import TooManyConnections
 
 notif_uc = NotificationUC()
 notif_bp = Blueprint("notif_bp", __name__, url_prefix="/api/notifications")
@@ -9,8 +10,41 @@ notif_bp = Blueprint("notif_bp", __name__, url_prefix="/api/notifications")
 @require_auth
 def list_notifications():
     only_unread = request.args.get("unread", "false").lower() == "true"
-    items = notif_uc.list_for_user(g.current_user.id, only_unread)
-    return jsonify(items), 200
+    page = notif_uc.list_for_user(
+        g.current_user.id,
+        only_unread,
+        cursor=request.args.get("cursor"),
+        limit=request.args.get("limit")
+    )
+    return jsonify(page), 200
+
+@notif_bp.route("/stream", methods=["GET"])
+@require_auth
+def stream_notifications():
+    last_event_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+
+    try:
+        stream = notif_uc.open_stream(
+            g.current_user.id,
+            last_event_id,
+            heartbeat_seconds=current_app.config.get("NOTIFICATION_STREAM_HEARTBEAT_SECONDS", 15),
+            poll_seconds=current_app.config.get("NOTIFICATION_STREAM_POLL_SECONDS", 5)
+        )
+    except TooManyConnections:
+        resp = jsonify({"error": "Too many live connections, fall back to polling"})
+        resp.headers["Retry-After"] = "30"
+        return resp, 503
+
+    return Response(
+        stream,
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@notif_bp.route("/unread-count", methods=["GET"])
+@require_auth
+def unread_count():
+    return jsonify({"unread": notif_uc.unread_count(g.current_user.id)}), 200
 
 @notif_bp.route("/<int:id>/read", methods=["PUT"])
 @require_auth
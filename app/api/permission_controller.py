@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify, g
 from app.utils.uc_provider import provide_permission_uc
-from app.utils.auth_middleware import require_auth
+from app.utils.auth_middleware import require_auth, require_permission
+from app.utils.permission_cache import permission_cache
 
 permission_bp = Blueprint("permission_bp", __name__, url_prefix="/api/permissions")
 
@@ -90,3 +91,9 @@ def get_permission_by_code(code):
         return jsonify(perm), 200 if perm else 404
     except PermissionError as e:
         return jsonify({"error": str(e)}), 403
+
+
+@permission_bp.route("/cache-stats", methods=["GET"])
+@require_permission("ROLE_MANAGE")
+def get_permission_cache_stats():
+    return jsonify(permission_cache.stats()), 200
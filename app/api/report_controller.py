@@ -1,7 +1,7 @@
 from flask import Blueprint, request, send_file, jsonify, g
 from app.utils.uc_provider import provide_report_uc
-from app.utils.auth_middleware import require_auth
-import io
+from app.utils.auth_middleware import require_auth, require_permission
+from app.utils.report_cache import report_cache
 
 report_bp = Blueprint("report_bp", __name__, url_prefix="/api/reports")
 
@@ -14,21 +14,74 @@ def export_report():
 
     try:
         payload = request.get_json() or {}
-        binary = uc.export_report(user.id, payload)
+        download_name, mimetype = uc.export_file_info(payload)
+        report_file = uc.export_report(user.id, payload)
 
+        # streamed from the spooled temp file, which is closed afterwards
         return send_file(
-            io.BytesIO(binary),
-            download_name=f"report_{payload.get('type', 'data')}.xlsx",
+            report_file,
+            download_name=download_name,
             as_attachment=True,
-            mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            mimetype=mimetype
         )
     except PermissionError as e:
         return jsonify({"error": str(e)}), 403
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         print("EXPORT ERROR:", e)
         return jsonify({"error": str(e)}), 500
 
 
+@report_bp.route("/export-jobs", methods=["POST"])
+@require_auth
+def submit_export_job():
+    uc = provide_report_uc()
+    user = g.current_user
+
+    try:
+        payload = request.get_json() or {}
+        job = uc.submit_export(user.id, payload)
+        return jsonify(job), 202
+    except PermissionError as e:
+        return jsonify({"error": str(e)}), 403
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print("EXPORT JOB ERROR:", e)
+        return jsonify({"error": str(e)}), 500
+
+
+@report_bp.route("/export-jobs/<job_id>", methods=["GET"])
+@require_auth
+def export_job_status(job_id):
+    uc = provide_report_uc()
+    user = g.current_user
+
+    try:
+        return jsonify(uc.get_export_job(user.id, job_id)), 200
+    except LookupError as e:
+        return jsonify({"error": str(e)}), 404
+
+
+@report_bp.route("/export-jobs/<job_id>/download", methods=["GET"])
+def download_export_job(job_id):
+    uc = provide_report_uc()
+
+    try:
+        path, filename, mimetype = uc.get_export_file(job_id, request.args.get("token"))
+        return send_file(
+            path,
+            download_name=filename,
+            as_attachment=True,
+            mimetype=mimetype
+        )
+    except LookupError as e:
+        return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 409
+
+
 @report_bp.route("/statistics", methods=["GET"])
 @require_auth
 def statistics():
@@ -68,7 +121,7 @@ def view_report():
             "project_id": request.args.get("project_id")
         }
         data = uc.view_report(user.id, filters)
-        return jsonify([d.to_dict() for d in data]), 200
+        return jsonify(data), 200
     except PermissionError as e:
         return jsonify({"error": str(e)}), 403
     except Exception as e:
@@ -86,3 +139,9 @@ def majors():
         return jsonify(data), 200
     except PermissionError as e:
         return jsonify({"error": str(e)}), 403
+
+
+@report_bp.route("/cache-stats", methods=["GET"])
+@require_permission("VIEW_REPORT")
+def report_cache_stats():
+    return jsonify(report_cache.stats()), 200
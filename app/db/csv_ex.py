@@ -0,0 +1,75 @@
+import csv
+import io
+import itertools
+import shutil
+import zipfile
+from tempfile import SpooledTemporaryFile
+
+# files larger than this spill from memory to disk
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+# rows handed to csv.writerows at a time
+CSV_CHUNK_ROWS = 1000
+
+
+def bundle_parts(parts, extension, path=None):
+    """Return the single part as is, or zip several as ``<name>.<extension>``.
+
+    Written to `path` when given, otherwise returned as a rewound spooled file.
+    """
+    if len(parts) == 1:
+        _, out = parts[0]
+    else:
+        out = SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+        with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name, part in parts:
+                part.seek(0)
+                with zf.open(f"{name}.{extension}", "w") as entry:
+                    shutil.copyfileobj(part, entry)
+                part.close()
+    out.seek(0)
+
+    if path:
+        with open(path, "wb") as f:
+            shutil.copyfileobj(out, f)
+        out.close()
+        return path
+    return out
+
+
+class StreamingCsvWriter:
+    """CSV export with the StreamingExcelWriter interface; each sheet is one
+    CSV written in fixed-size chunks, several sheets are zipped."""
+
+    extension = "csv"
+    mimetype = "text/csv"
+    multi_part = True
+
+    def __init__(self, progress=None):
+        self.progress = progress
+        self.rows_written = 0
+        self.parts = []
+
+    def add_sheet(self, name, title, columns, rows, **_):
+        """Header row plus `rows`; title and styling options do not apply."""
+        part = SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+        # BOM so Excel opens the Vietnamese text as UTF-8
+        text = io.TextIOWrapper(part, encoding="utf-8-sig", newline="")
+        writer = csv.writer(text)
+        writer.writerow(columns)
+
+        rows = iter(rows)
+        while True:
+            chunk = list(itertools.islice(rows, CSV_CHUNK_ROWS))
+            if not chunk:
+                break
+            writer.writerows(chunk)
+            self.rows_written += len(chunk)
+            if self.progress:
+                self.progress(self.rows_written)
+
+        text.flush()
+        text.detach()
+        self.parts.append((name, part))
+
+    def finish(self, path=None):
+        return bundle_parts(self.parts, self.extension, path)
@@ -9,3 +9,10 @@ def load_models():
     import app.models.feedback
     import app.models.activitylog
     import app.models.intern_project
+    import app.models.rating_summary
+    import app.models.outbox
+    import app.models.report_mart
+    import app.models.export_job
+    import app.models.report_data_version
+    # marks mart days dirty on intern / project / feedback flushes
+    import app.repo.report_mart_repo
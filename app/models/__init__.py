@@ -7,8 +7,10 @@ from .user import User
 from .intern import Intern
 from .project import Project
 from .feedback import Feedback
-from .activitylog import ActivityLog
+from .activitylog import ActivityLog, ActivityLogArchive
 from .training_plan import TrainingPlan
+from .rating_summary import InternRatingSummary, ProjectRatingSummary
+from .outbox import OutboxMessage
 
 __all__ = [
     "User", 
@@ -19,6 +21,10 @@ __all__ = [
     "Feedback",
     "InternProject",
     "ActivityLog",
+    "ActivityLogArchive",
     "TrainingPlan",
+    "InternRatingSummary",
+    "ProjectRatingSummary",
+    "OutboxMessage",
     "role_permissions",
 ]
@@ -12,6 +12,12 @@ class ActivityLog(db.Model):
 
     user = db.relationship("User", back_populates="logs")
 
+    __table_args__ = (
+        db.Index("ix_activity_logs_timestamp_desc", timestamp.desc(), id.desc()),
+        db.Index("ix_activity_logs_user_timestamp", user_id, timestamp.desc(), id.desc()),
+        db.Index("ix_activity_logs_action_timestamp", action, timestamp.desc(), id.desc()),
+    )
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -20,3 +26,16 @@ class ActivityLog(db.Model):
             "details": self.details,
             "timestamp": self.timestamp
         }
+
+
+class ActivityLogArchive(db.Model):
+    """Cold copy of activity logs past the retention window (no FK, so
+    archived rows survive user deletion)."""
+    __tablename__ = "activity_logs_archive"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    user_id = db.Column(db.Integer, nullable=True)
+    action = db.Column(db.String(80), nullable=False)
+    details = db.Column(db.Text)
+    timestamp = db.Column(db.DateTime(timezone=True), index=True)
+    archived_at = db.Column(db.DateTime(timezone=True), server_default=db.func.now())
@@ -0,0 +1,48 @@
+import hmac
+from datetime import datetime, timezone
+from app.db.db import db
+
+
+def _iso(value):
+    # stored as naive UTC
+    return value.replace(tzinfo=timezone.utc).isoformat() if value else None
+
+
+class ExportJob(db.Model):
+    """A background report export. The row is shared by every worker
+    process; the file itself lives in the shared EXPORT_JOB_DIR."""
+    __tablename__ = "report_export_jobs"
+
+    id = db.Column(db.String(32), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    filename = db.Column(db.String(255), nullable=False)
+    mimetype = db.Column(db.String(100), nullable=False)
+
+    # "queued" | "running" | "done" | "failed"
+    status = db.Column(db.String(20), nullable=False, default="queued")
+    rows = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text, nullable=True)
+    download_token = db.Column(db.String(64), nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    # row and file are swept after this
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def check_token(self, token):
+        return bool(token) and hmac.compare_digest(token, self.download_token)
+
+    def to_dict(self):
+        data = {
+            "job_id": self.id,
+            "status": self.status,
+            "filename": self.filename,
+            "rows": self.rows,
+            "error": self.error,
+            "created_at": _iso(self.created_at),
+            "finished_at": _iso(self.finished_at),
+        }
+        if self.status == "done":
+            data["download_url"] = f"/api/reports/export-jobs/{self.id}/download?token={self.download_token}"
+            data["expires_at"] = _iso(self.expires_at)
+        return data
@@ -31,6 +31,17 @@ class Feedback(db.Model):
     to_intern = db.relationship("Intern", back_populates="feedbacks")
     to_project = db.relationship("Project", back_populates="feedbacks")
 
+    __table_args__ = (
+        # date-filtered report statistics read only these columns
+        db.Index(
+            "ix_feedbacks_live_created",
+            created_at,
+            postgresql_include=["score", "to_intern_id", "to_project_id"],
+            postgresql_where=(is_deleted == False),
+            sqlite_where=(is_deleted == False),
+        ),
+    )
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -20,6 +20,10 @@ class Intern(db.Model):
     feedbacks = db.relationship("Feedback", back_populates="to_intern")
     training_plans = db.relationship("TrainingPlan", back_populates="intern")
 
+    def set_counts(self, project_count, avg_rating):
+        """Attach aggregates precomputed in SQL (see InternRepo.get_all_with_counts)."""
+        self._counts = (project_count, avg_rating)
+
     def to_dict(self, with_counts=False):
         data = {
             "id": self.id,
@@ -34,8 +38,13 @@ class Intern(db.Model):
         }
 
         if with_counts:
-            data["project_count"] = len(self.intern_projects or [])
-            valid = [f.score for f in self.feedbacks if not f.is_deleted]
-            data["avg_rating"] = round(sum(valid) / len(valid), 1) if valid else None
+            # no per-row fallback query: load interns through InternRepo *_with_counts
+            counts = getattr(self, "_counts", None)
+            if counts is None:
+                raise RuntimeError(f"Counts not loaded for intern {self.id}; use InternRepo.get_by_id_with_counts")
+
+            project_count, avg_rating = counts
+            data["project_count"] = project_count
+            data["avg_rating"] = round(float(avg_rating), 1) if avg_rating is not None else None
 
         return data
@@ -19,6 +19,17 @@ class Notification(db.Model):
 
     user = db.relationship("User", backref="notifications")
 
+    __table_args__ = (
+        # the unread badge only ever counts unread rows
+        db.Index(
+            "ix_notifications_user_unread",
+            user_id,
+            postgresql_where=(is_read == False),
+            sqlite_where=(is_read == False),
+        ),
+        db.Index("ix_notifications_user_created", user_id, created_at.desc(), id.desc()),
+    )
+
     def to_dict(self):
         return {
             "id": self.id,
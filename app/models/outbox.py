@@ -0,0 +1,37 @@
+from datetime import datetime
+from app.db.db import db
+
+
+class OutboxMessage(db.Model):
+    """A notification or mail intent, written in the business transaction
+    and delivered later by the outbox dispatcher."""
+    __tablename__ = "outbox_messages"
+
+    id = db.Column(db.Integer, primary_key=True)
+    # "notification" | "mail"
+    kind = db.Column(db.String(20), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+
+    # "pending" | "sending" | "failed"; delivered rows are deleted.
+    # While "sending", available_at is the end of the SMTP lease.
+    status = db.Column(db.String(20), nullable=False, default="pending")
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text, nullable=True)
+    available_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index("ix_outbox_messages_status_available", status, available_at, id),
+    )
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "payload": self.payload,
+            "status": self.status,
+            "attempts": self.attempts,
+            "last_error": self.last_error,
+            "available_at": self.available_at.isoformat() if self.available_at else None,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
@@ -1,7 +1,5 @@
 from app.db.db import db
 from datetime import date
-from sqlalchemy import func
-from app.models.feedback import Feedback
 
 class Project(db.Model):
     __tablename__ = "projects"
@@ -17,6 +15,17 @@ class Project(db.Model):
     project_interns = db.relationship("InternProject", back_populates="project")
     feedbacks = db.relationship("Feedback", back_populates="to_project")
 
+    def set_stats(self, rating_count, avg_rating, intern_count=None):
+        """Attach aggregates precomputed in SQL (see ProjectRepo.with_stats)."""
+        self._stats = (rating_count or 0, avg_rating, intern_count)
+
+    def _get_stats(self):
+        # no per-row fallback query: load projects through ProjectRepo
+        stats = getattr(self, "_stats", None)
+        if stats is None:
+            raise RuntimeError(f"Stats not loaded for project {self.id}; use ProjectRepo.fetch_with_stats")
+        return stats
+
     def to_dict(self, with_counts=False):
         data = {
             "id": self.id,
@@ -28,18 +37,16 @@ class Project(db.Model):
             "is_deleted": self.is_deleted,
         }
 
-        valid_feedbacks = [f for f in self.feedbacks if not f.is_deleted]
-
-        scores = [f.score for f in valid_feedbacks if f.score is not None]
+        rating_count, avg_rating, intern_count = self._get_stats()
 
-        if scores:
-            data["rating"] = round(sum(scores) / len(scores), 1)
-            data["rating_count"] = len(scores)
+        if rating_count:
+            data["rating"] = round(float(avg_rating), 1)
+            data["rating_count"] = rating_count
         else:
             data["rating"] = 0
             data["rating_count"] = 0
 
         if with_counts:
-            data["intern_count"] = len(self.project_interns or [])
+            data["intern_count"] = intern_count
 
         return data
@@ -0,0 +1,42 @@
+from app.db.db import db
+
+
+class InternRatingSummary(db.Model):
+    __tablename__ = "intern_rating_summary"
+
+    intern_id = db.Column(db.Integer, db.ForeignKey("interns.id"), primary_key=True)
+    feedback_type = db.Column(db.String(30), primary_key=True)
+
+    score_sum = db.Column(db.Integer, default=0, nullable=False)
+    score_count = db.Column(db.Integer, default=0, nullable=False)
+    # {"<score>": <count>} for every non-deleted feedback
+    histogram = db.Column(db.JSON, default=dict, nullable=False)
+
+    def to_dict(self):
+        return {
+            "intern_id": self.intern_id,
+            "feedback_type": self.feedback_type,
+            "score_sum": self.score_sum,
+            "score_count": self.score_count,
+            "histogram": self.histogram,
+        }
+
+
+class ProjectRatingSummary(db.Model):
+    __tablename__ = "project_rating_summary"
+
+    project_id = db.Column(db.Integer, db.ForeignKey("projects.id"), primary_key=True)
+    feedback_type = db.Column(db.String(30), primary_key=True)
+
+    score_sum = db.Column(db.Integer, default=0, nullable=False)
+    score_count = db.Column(db.Integer, default=0, nullable=False)
+    histogram = db.Column(db.JSON, default=dict, nullable=False)
+
+    def to_dict(self):
+        return {
+            "project_id": self.project_id,
+            "feedback_type": self.feedback_type,
+            "score_sum": self.score_sum,
+            "score_count": self.score_count,
+            "histogram": self.histogram,
+        }
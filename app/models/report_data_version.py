@@ -0,0 +1,11 @@
+from app.db.db import db
+
+
+class ReportDataVersion(db.Model):
+    """Single-row counter shared by every process; bumped after each write
+    that can change report results, so cached results from any worker can
+    tell they are stale."""
+    __tablename__ = "report_data_version"
+
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
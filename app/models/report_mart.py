@@ -0,0 +1,66 @@
+from app.db.db import db
+from datetime import datetime
+
+
+# Pre-aggregated daily facts for reporting. Rows are rebuilt per day by
+# the mart refresher from the days listed in mart_dirty_days; day is NULL
+# for source rows without a date. Each fact has one row per key (NULLs
+# included), which the refresh upserts against.
+
+class InternDailyFact(db.Model):
+    __tablename__ = "mart_intern_daily"
+
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date)  # interns.start_date
+    major = db.Column(db.String(100))
+    intern_count = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint(day, major, name="uq_mart_intern_daily_key",
+                            postgresql_nulls_not_distinct=True),
+    )
+
+
+class ProjectDailyFact(db.Model):
+    __tablename__ = "mart_project_daily"
+
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date)  # projects.start_date
+    status = db.Column(db.String(20))
+    project_count = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint(day, status, name="uq_mart_project_daily_key",
+                            postgresql_nulls_not_distinct=True),
+    )
+
+
+class FeedbackDailyFact(db.Model):
+    __tablename__ = "mart_feedback_daily"
+
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date)  # feedbacks.created_at (UTC day)
+    # "intern", "project" (feedback only about a project) or NULL
+    target = db.Column(db.String(10))
+    score = db.Column(db.Integer, nullable=False)
+    feedback_count = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint(day, target, score, name="uq_mart_feedback_daily_key",
+                            postgresql_nulls_not_distinct=True),
+    )
+
+
+class ReportMartDirtyDay(db.Model):
+    __tablename__ = "mart_dirty_days"
+
+    id = db.Column(db.Integer, primary_key=True)
+    fact = db.Column(db.String(20), nullable=False)  # intern / project / feedback
+    day = db.Column(db.Date)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # writers skip a day that is already waiting for the refresher
+        db.UniqueConstraint(fact, day, name="uq_mart_dirty_days_key",
+                            postgresql_nulls_not_distinct=True),
+    )
@@ -8,6 +8,8 @@ class Role(db.Model):
     code = db.Column(db.String(50), unique=True, nullable=False)
     description = db.Column(db.String(255))
     is_deleted = db.Column(db.Boolean, default=False)
+    # bumped whenever the role's permission set changes; embedded in access tokens
+    permissions_version = db.Column(db.Integer, default=1, nullable=False)
 
     permissions = db.relationship(
         "Permission",
@@ -34,6 +34,10 @@ class User(db.Model):
             return []
         return [p.code for p in self.role.permissions]
 
+    @property
+    def permissions_version(self):
+        return self.role.permissions_version if self.role else 0
+
     def set_password(self, pw):
         self.password_hash = generate_password_hash(pw)
 
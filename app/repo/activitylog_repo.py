@@ -1,6 +1,8 @@
-from app.models.activitylog import ActivityLog
+from app.models.activitylog import ActivityLog, ActivityLogArchive
+from app.models.user import User
 from app.db.db import db
 from app.repo.base_repo import BaseRepo
+from sqlalchemy import and_, or_, func, select
 from datetime import datetime, timezone
 
 class ActivityLogRepo(BaseRepo):
@@ -8,6 +10,77 @@ class ActivityLogRepo(BaseRepo):
     def get_all(self):
         return ActivityLog.query.order_by(ActivityLog.timestamp.desc()).all()
 
+    def get_recent(self, limit=10):
+        return (
+            db.session.query(
+                User.username,
+                ActivityLog.action,
+                ActivityLog.details,
+                ActivityLog.timestamp
+            )
+            .outerjoin(User, User.id == ActivityLog.user_id)
+            .order_by(ActivityLog.timestamp.desc())
+            .limit(limit)
+            .all()
+        )
+
+    def _filtered_query(self, filters):
+        query = (
+            db.session.query(
+                ActivityLog.id,
+                ActivityLog.user_id,
+                User.username,
+                ActivityLog.action,
+                ActivityLog.details,
+                ActivityLog.timestamp
+            )
+            .outerjoin(User, User.id == ActivityLog.user_id)
+        )
+
+        if filters.get("user_id") is not None:
+            query = query.filter(ActivityLog.user_id == filters["user_id"])
+        if filters.get("action"):
+            query = query.filter(ActivityLog.action == filters["action"])
+        if filters.get("from_time"):
+            query = query.filter(ActivityLog.timestamp >= filters["from_time"])
+        if filters.get("to_time"):
+            query = query.filter(ActivityLog.timestamp < filters["to_time"])
+
+        return query
+
+    def get_page(self, filters, after=None, limit=50):
+        """Keyset page ordered by (timestamp, id) descending.
+
+        `after` is the (timestamp, id) of the last row already seen.
+        Returns the rows and whether more rows follow.
+        """
+        query = self._filtered_query(filters)
+
+        if after:
+            ts, log_id = after
+            query = query.filter(
+                or_(
+                    ActivityLog.timestamp < ts,
+                    and_(ActivityLog.timestamp == ts, ActivityLog.id < log_id)
+                )
+            )
+
+        rows = (
+            query.order_by(ActivityLog.timestamp.desc(), ActivityLog.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+        return rows[:limit], len(rows) > limit
+
+    def iter_filtered(self, filters, batch_size=1000):
+        after = None
+        while True:
+            rows, has_more = self.get_page(filters, after, batch_size)
+            yield from rows
+            if not has_more:
+                return
+            after = (rows[-1].timestamp, rows[-1].id)
+
     def get_by_id(self, log_id):
         return ActivityLog.query.get(log_id)
 
@@ -52,6 +125,57 @@ class ActivityLogRepo(BaseRepo):
         db.session.add(log)
         db.session.commit()
         return log
+    def count_archivable(self, cutoff):
+        return (
+            db.session.query(func.count(ActivityLog.id))
+            .filter(ActivityLog.timestamp < cutoff)
+            .scalar()
+        )
+
+    def archive_batch(self, cutoff, batch_size=1000):
+        """Move at most `batch_size` logs older than `cutoff` into
+        activity_logs_archive (INSERT ... SELECT + DELETE) in one commit.
+        The ids are claimed with SKIP LOCKED, so concurrent runs take
+        disjoint batches instead of archiving the same row twice."""
+        ids = [
+            r.id for r in
+            db.session.query(ActivityLog.id)
+            .filter(ActivityLog.timestamp < cutoff)
+            .order_by(ActivityLog.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        ]
+        if not ids:
+            return 0
+
+        columns = ["id", "user_id", "action", "details", "timestamp"]
+        db.session.execute(
+            ActivityLogArchive.__table__.insert().from_select(
+                columns,
+                select(
+                    ActivityLog.id,
+                    ActivityLog.user_id,
+                    ActivityLog.action,
+                    ActivityLog.details,
+                    ActivityLog.timestamp
+                ).where(ActivityLog.id.in_(ids))
+            )
+        )
+        ActivityLog.query.filter(ActivityLog.id.in_(ids)).delete(synchronize_session=False)
+
+        db.session.commit()
+        return len(ids)
+
+    def bulk_insert(self, entries):
+        """Insert many log rows in one statement on its own connection,
+        so request sessions are never committed as a side effect."""
+        if not entries:
+            return 0
+        with db.engine.begin() as conn:
+            conn.execute(ActivityLog.__table__.insert(), entries)
+        return len(entries)
+
     def get_logs_for_user(self, user_id):
         return ActivityLog.query.filter_by(user_id=user_id)\
         .order_by(ActivityLog.timestamp.desc())\
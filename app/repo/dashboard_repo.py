@@ -0,0 +1,78 @@
+from app.db.db import db
+from app.models.intern import Intern
+from app.models.project import Project
+from app.models.feedback import Feedback
+from app.models.user import User
+from app.repo.rating_summary_repo import RatingSummaryRepo
+from sqlalchemy import func, select, cast, Float
+
+
+class DashboardRepo:
+    """Aggregate queries for the dashboard; nothing here loads whole tables."""
+
+    def __init__(self, rating_summary_repo=None):
+        self.rating_summary_repo = rating_summary_repo or RatingSummaryRepo()
+
+    def get_counts(self):
+        def count_of(model, *criteria):
+            return select(func.count(model.id)).where(*criteria).scalar_subquery()
+
+        row = db.session.execute(select(
+            count_of(Intern, Intern.is_deleted == False).label("total_interns"),
+            count_of(Project, Project.is_deleted == False).label("total_projects"),
+            count_of(Feedback, Feedback.is_deleted == False).label("total_feedbacks"),
+            count_of(User, User.is_deleted == False, User.is_active == True).label("active_users"),
+        )).one()
+
+        return dict(row._mapping)
+
+    def _ranking_query(self, entity, columns, ratings, key_column):
+        average = func.coalesce(
+            cast(ratings.c.score_sum, Float) / func.nullif(ratings.c.score_count, 0),
+            0
+        ).label("average_rating")
+
+        query = (
+            db.session.query(*columns, average, func.coalesce(ratings.c.score_count, 0).label("feedback_count"))
+            .outerjoin(ratings, key_column == entity.id)
+            .filter(entity.is_deleted == False)
+        )
+        return query, average
+
+    def _overall_average(self, entity, ratings, key_column):
+        value = (
+            db.session.query(func.avg(cast(ratings.c.score_sum, Float) / ratings.c.score_count))
+            .join(entity, key_column == entity.id)
+            .filter(entity.is_deleted == False, ratings.c.score_count > 0)
+            .scalar()
+        )
+        return float(value) if value is not None else 0
+
+    def rank_interns(self, feedback_types, limit=5):
+        ratings = self.rating_summary_repo.intern_rating_subquery(feedback_types)
+        query, average = self._ranking_query(
+            Intern, (Intern.id, Intern.name, Intern.email), ratings, ratings.c.intern_id
+        )
+
+        top = query.order_by(average.desc(), Intern.id).limit(limit).all()
+        # lowest N, returned in the same (descending) order as ``top``
+        low = list(reversed(query.order_by(average.asc(), Intern.id.desc()).limit(limit).all()))
+
+        return {
+            "average": self._overall_average(Intern, ratings, ratings.c.intern_id),
+            "top": [dict(r._mapping) for r in top],
+            "low": [dict(r._mapping) for r in low],
+        }
+
+    def rank_projects(self, feedback_types, limit=5):
+        ratings = self.rating_summary_repo.project_rating_subquery(feedback_types)
+        query, average = self._ranking_query(
+            Project, (Project.id, Project.title, Project.status), ratings, ratings.c.project_id
+        )
+
+        top = query.order_by(average.desc(), Project.id).limit(limit).all()
+
+        return {
+            "average": self._overall_average(Project, ratings, ratings.c.project_id),
+            "top": [dict(r._mapping) for r in top],
+        }
@@ -0,0 +1,65 @@
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import delete, select, update
+from app.db.db import db
+from app.models.export_job import ExportJob
+
+
+class ExportJobRepo:
+    """Status updates go through their own connection: the export worker
+    writes them while its session is still streaming the report."""
+
+    def create(self, user_id, payload, filename, mimetype, ttl_seconds):
+        now = datetime.utcnow()
+        job = ExportJob(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            payload=payload,
+            filename=filename,
+            mimetype=mimetype,
+            status="queued",
+            rows=0,
+            download_token=secrets.token_urlsafe(24),
+            created_at=now,
+            expires_at=now + timedelta(seconds=ttl_seconds)
+        )
+        db.session.add(job)
+        db.session.commit()
+        return job
+
+    def get(self, job_id):
+        return db.session.get(ExportJob, job_id)
+
+    def update(self, job_id, **values):
+        with db.engine.begin() as conn:
+            return conn.execute(
+                update(ExportJob).where(ExportJob.id == job_id).values(**values)
+            ).rowcount
+
+    def finish(self, job_id, status, ttl_seconds, error=None):
+        now = datetime.utcnow()
+        return self.update(
+            job_id, status=status, error=error, finished_at=now,
+            expires_at=now + timedelta(seconds=ttl_seconds)
+        )
+
+    def fail_unfinished(self, job_ids, error):
+        if not job_ids:
+            return 0
+        with db.engine.begin() as conn:
+            return conn.execute(
+                update(ExportJob)
+                .where(ExportJob.id.in_(job_ids), ExportJob.status.in_(["queued", "running"]))
+                .values(status="failed", error=error, finished_at=datetime.utcnow())
+            ).rowcount
+
+    def delete_expired(self):
+        """Drop expired jobs; returns their ids so the files can go too."""
+        with db.engine.begin() as conn:
+            ids = conn.execute(
+                select(ExportJob.id).where(ExportJob.expires_at <= datetime.utcnow())
+            ).scalars().all()
+            if ids:
+                conn.execute(delete(ExportJob).where(ExportJob.id.in_(ids)))
+        return ids
@@ -3,14 +3,23 @@ from app.db.db import db
 from datetime import datetime
 
 from app.models.user import User
+from app.repo.rating_summary_repo import RatingSummaryRepo
+from app.utils.dashboard_cache import mark_dashboard_dirty
+from app.utils.report_cache import bump_report_data_version
 
 
 class FeedbackRepo:
 
+    def __init__(self, rating_summary_repo=None):
+        self.rating_summary_repo = rating_summary_repo or RatingSummaryRepo()
+
     def create(self, data):
         fb = Feedback(**data)
         db.session.add(fb)
+        self.rating_summary_repo.record_change(None, RatingSummaryRepo.snapshot(fb))
         db.session.commit()
+        mark_dashboard_dirty()
+        bump_report_data_version()
         return fb
     
     def get_all(self):
@@ -56,17 +65,25 @@ class FeedbackRepo:
         fb = self.get_by_id(feedback_id)
         if not fb:
             return None
+        before = RatingSummaryRepo.snapshot(fb)
         for k, v in data.items():
             setattr(fb, k, v)
         fb.updated_at = datetime.utcnow()
+        self.rating_summary_repo.record_change(before, RatingSummaryRepo.snapshot(fb))
         db.session.commit()
+        mark_dashboard_dirty()
+        bump_report_data_version()
         return fb
 
     def soft_delete(self, feedback_id):
         fb = self.get_by_id(feedback_id)
         if not fb:
             return None
+        before = RatingSummaryRepo.snapshot(fb)
         fb.is_deleted = True
         fb.updated_at = datetime.utcnow()
+        self.rating_summary_repo.record_change(before, RatingSummaryRepo.snapshot(fb))
         db.session.commit()
+        mark_dashboard_dirty()
+        bump_report_data_version()
         return True
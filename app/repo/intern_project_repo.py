@@ -91,6 +91,20 @@ class InternProjectRepo:
         
         return result
     
+    def get_user_ids_by_project(self, project_id: int):
+        """Account ids of the (non-deleted) interns assigned to a project"""
+        rows = (
+            db.session.query(Intern.user_id)
+            .join(InternProject, InternProject.intern_id == Intern.id)
+            .filter(
+                InternProject.project_id == project_id,
+                Intern.is_deleted == False,
+                Intern.user_id.isnot(None)
+            )
+            .all()
+        )
+        return [r.user_id for r in rows]
+
     def get_all_assignments(self):
         return InternProject.query.options(
             joinedload(InternProject.intern),
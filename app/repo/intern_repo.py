@@ -1,12 +1,69 @@
 from app.db.db import db
 from app.models.intern import Intern
+from app.models.intern_project import InternProject
+from app.models.project import Project
+from app.repo.project_repo import ProjectRepo
+from app.repo.rating_summary_repo import RatingSummaryRepo
+from sqlalchemy import func
 from sqlalchemy.exc import SQLAlchemyError
+from app.utils.dashboard_cache import mark_dashboard_dirty
+from app.utils.report_cache import bump_report_data_version
 
 class InternRepo:
 
     def get_all(self):
         return Intern.query.filter_by(is_deleted=False).all()
 
+    def _with_counts_query(self):
+        project_counts = (
+            db.session.query(
+                InternProject.intern_id.label("intern_id"),
+                func.count().label("project_count")
+            )
+            .group_by(InternProject.intern_id)
+            .subquery()
+        )
+
+        ratings = RatingSummaryRepo().intern_rating_subquery()
+
+        return (
+            db.session.query(
+                Intern,
+                project_counts.c.project_count,
+                ratings.c.score_sum,
+                ratings.c.score_count
+            )
+            .outerjoin(project_counts, project_counts.c.intern_id == Intern.id)
+            .outerjoin(ratings, ratings.c.intern_id == Intern.id)
+            .filter(Intern.is_deleted == False)
+        )
+
+    def _attach_counts(self, rows):
+        interns = []
+        for intern, project_count, score_sum, score_count in rows:
+            avg_rating = score_sum / score_count if score_count else None
+            intern.set_counts(project_count or 0, avg_rating)
+            interns.append(intern)
+        return interns
+
+    def get_all_with_counts(self):
+        """Interns with project_count / avg_rating computed by one grouped query."""
+        return self._attach_counts(self._with_counts_query().order_by(Intern.id).all())
+
+    def get_by_id_with_counts(self, intern_id):
+        rows = self._with_counts_query().filter(Intern.id == intern_id).all()
+        interns = self._attach_counts(rows)
+        return interns[0] if interns else None
+
+    def get_projects(self, intern_id):
+        """Live projects the intern is assigned to, with stats attached."""
+        return ProjectRepo().fetch_with_stats(
+            Project.query
+            .join(InternProject, InternProject.project_id == Project.id)
+            .filter(InternProject.intern_id == intern_id, Project.is_deleted == False)
+            .order_by(Project.id)
+        )
+
     def get_by_id(self, intern_id):
         return Intern.query.filter_by(id=intern_id, is_deleted=False).first()
 
@@ -25,6 +82,9 @@ class InternRepo:
             intern = Intern(**data)
             db.session.add(intern)
             db.session.commit()
+            mark_dashboard_dirty()
+            bump_report_data_version()
+            intern.set_counts(0, None)
             return intern
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -34,6 +94,8 @@ class InternRepo:
         """CHỈ commit object, không dùng intern.__dict__ để tránh lỗi."""
         try:
             db.session.commit()
+            mark_dashboard_dirty()
+            bump_report_data_version()
             return intern
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -51,6 +113,8 @@ class InternRepo:
                 db.session.delete(intern)
 
             db.session.commit()
+            mark_dashboard_dirty()
+            bump_report_data_version()
             return True
 
         except SQLAlchemyError:
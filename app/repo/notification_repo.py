@@ -1,5 +1,6 @@
 from app.models.notification import Notification
 from app.db.db import db
+from sqlalchemy import and_, or_, func, select
 from datetime import datetime
 
 
@@ -27,6 +28,54 @@ class NotificationRepo:
         
         return query.order_by(Notification.created_at.desc()).all()
 
+    def get_page(self, user_id: int, only_unread: bool = False, after=None, limit: int = 20):
+        """Keyset page ordered by (created_at, id) descending; `after` is the
+        (created_at, id) of the last row already seen."""
+        query = Notification.query.filter(Notification.user_id == user_id)
+
+        if only_unread:
+            query = query.filter(Notification.is_read == False)
+
+        if after:
+            ts, notif_id = after
+            query = query.filter(
+                or_(
+                    Notification.created_at < ts,
+                    and_(Notification.created_at == ts, Notification.id < notif_id)
+                )
+            )
+
+        rows = (
+            query.order_by(Notification.created_at.desc(), Notification.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+        return rows[:limit], len(rows) > limit
+
+    def get_since(self, user_id: int, last_id: int, limit: int = 100):
+        """Notifications newer than `last_id`, oldest first (SSE resume)."""
+        return (
+            Notification.query
+            .filter(Notification.user_id == user_id, Notification.id > last_id)
+            .order_by(Notification.id)
+            .limit(limit)
+            .all()
+        )
+
+    def latest_id(self, user_id: int) -> int:
+        return (
+            db.session.query(func.max(Notification.id))
+            .filter(Notification.user_id == user_id)
+            .scalar()
+        ) or 0
+
+    def count_unread(self, user_id: int) -> int:
+        return (
+            db.session.query(func.count(Notification.id))
+            .filter(Notification.user_id == user_id, Notification.is_read == False)
+            .scalar()
+        )
+
     def get_by_id(self, notif_id: int):
         return Notification.query.get(notif_id)
 
@@ -65,14 +114,40 @@ class NotificationRepo:
         db.session.commit()
         return True
 
-    def delete_old_notifications(self, days: int = 30):
-        from datetime import timedelta
-        cutoff = datetime.utcnow() - timedelta(days=days)
-        
+    def _purgeable(self, cutoff):
+        return and_(Notification.created_at < cutoff, Notification.is_read == True)
+
+    def count_purgeable(self, cutoff) -> int:
+        return (
+            db.session.query(func.count(Notification.id))
+            .filter(self._purgeable(cutoff))
+            .scalar()
+        )
+
+    def purge_read_batch(self, cutoff, batch_size: int = 1000) -> int:
+        """Delete at most `batch_size` read notifications older than `cutoff`
+        and commit, so each statement only locks a small range."""
+        ids = (
+            select(Notification.id)
+            .where(self._purgeable(cutoff))
+            .order_by(Notification.id)
+            .limit(batch_size)
+            .scalar_subquery()
+        )
         count = Notification.query.filter(
-            Notification.created_at < cutoff,
-            Notification.is_read == True
-        ).delete()
-        
+            Notification.id.in_(ids)
+        ).delete(synchronize_session=False)
+
         db.session.commit()
-        return count
\ No newline at end of file
+        return count
+
+    def delete_old_notifications(self, days: int = 30, batch_size: int = 1000):
+        from datetime import timedelta
+        cutoff = datetime.utcnow() - timedelta(days=days)
+
+        total = 0
+        while True:
+            count = self.purge_read_batch(cutoff, batch_size)
+            total += count
+            if count < batch_size:
+                return total
\ No newline at end of file
@@ -0,0 +1,134 @@
+from app.db.db import db
+from app.models.outbox import OutboxMessage
+from app.models.notification import Notification
+from app.models.user import User
+from sqlalchemy import func
+from datetime import datetime, timedelta
+
+
+def recipient_ids(payload):
+    """Payloads address either one `user_id` or a `user_ids` list."""
+    if payload.get("user_ids"):
+        return payload["user_ids"]
+    if payload.get("user_id"):
+        return [payload["user_id"]]
+    return []
+
+
+class OutboxRepo:
+    """Outbox writes join the caller's transaction: nothing here commits
+    except the dispatcher-side `finish_batch`."""
+
+    def add(self, kind, payload):
+        message = OutboxMessage(
+            kind=kind,
+            payload=payload,
+            status="pending",
+            attempts=0,
+            available_at=datetime.utcnow(),
+            created_at=datetime.utcnow()
+        )
+        db.session.add(message)
+        # lets the dispatcher wake up as soon as this transaction commits
+        db.session.info["outbox_pending"] = True
+        return message
+
+    def add_notification(self, data):
+        return self.add("notification", data)
+
+    def add_mail(self, subject, body, user_id=None, to_email=None, user_ids=None):
+        return self.add("mail", {
+            "user_id": user_id,
+            "user_ids": user_ids,
+            "to_email": to_email,
+            "subject": subject,
+            "body": body,
+        })
+
+    def claim_batch(self, limit):
+        # SKIP LOCKED lets several dispatchers drain the outbox side by side;
+        # "sending" rows come back once their lease runs out (lost worker)
+        return (
+            OutboxMessage.query
+            .filter(
+                OutboxMessage.status.in_(["pending", "sending"]),
+                OutboxMessage.available_at <= datetime.utcnow()
+            )
+            .order_by(OutboxMessage.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+    def insert_notifications(self, payloads):
+        """One multi-row INSERT for every recipient of every payload.
+        Returns the inserted rows (with ids) for live delivery."""
+        now = datetime.utcnow()
+        rows = [
+            {
+                "user_id": user_id,
+                "title": p["title"],
+                "message": p["message"],
+                "type": p.get("type"),
+                "link_url": p.get("link_url"),
+                "meta": p.get("meta"),
+                "is_read": False,
+                "created_at": datetime.fromisoformat(p["created_at"]) if p.get("created_at") else now,
+            }
+            for p in payloads
+            for user_id in recipient_ids(p)
+        ]
+        if not rows:
+            return []
+        result = db.session.execute(
+            Notification.__table__.insert().returning(Notification.__table__.c.id),
+            rows
+        )
+        for row, inserted in zip(rows, result.all()):
+            row["id"] = inserted.id
+        return rows
+
+    def get_emails(self, user_ids):
+        if not user_ids:
+            return {}
+        rows = db.session.query(User.id, User.email).filter(User.id.in_(user_ids)).all()
+        return {r.id: r.email for r in rows}
+
+    def get(self, message_id):
+        return db.session.get(OutboxMessage, message_id)
+
+    def mark_sending(self, messages, lease_seconds):
+        """Lease mail rows to the SMTP workers so the claim can commit
+        before anything is sent."""
+        lease_until = datetime.utcnow() + timedelta(seconds=lease_seconds)
+        for message in messages:
+            message.status = "sending"
+            message.available_at = lease_until
+
+    def retry_later(self, message, error, backoff_seconds, max_attempts, failed_user_ids=None):
+        if failed_user_ids:
+            # only the recipients that failed are retried
+            message.payload = {**message.payload, "user_id": None, "user_ids": failed_user_ids}
+        message.attempts += 1
+        message.last_error = error
+        if message.attempts >= max_attempts:
+            message.status = "failed"
+        else:
+            message.status = "pending"
+            delay = backoff_seconds * 2 ** (message.attempts - 1)
+            message.available_at = datetime.utcnow() + timedelta(seconds=delay)
+
+    def finish_batch(self, delivered_ids):
+        if delivered_ids:
+            OutboxMessage.query.filter(
+                OutboxMessage.id.in_(delivered_ids)
+            ).delete(synchronize_session=False)
+        db.session.commit()
+
+    def count_by_status(self):
+        rows = (
+            db.session.query(OutboxMessage.status, func.count(OutboxMessage.id))
+            .group_by(OutboxMessage.status)
+            .all()
+        )
+        return {status: count for status, count in rows}
@@ -1,10 +1,13 @@
 from app.models.permission import Permission
 from app.models.user import User
 from app.models.role import Role
+from app.models.role_permission import role_permissions
 from app.db.db import db
 from app.interfaces.permission_port import PermissionRepoInterface
 from sqlalchemy.orm import joinedload
 from app.utils.exception import PermissionDenied
+from app.utils.permission_cache import permission_cache
+from app.utils.permission_scope import get_token_scope
 
 
 class PermissionRepo(PermissionRepoInterface):
@@ -30,13 +33,33 @@ class PermissionRepo(PermissionRepoInterface):
         db.session.commit()
         return perm
 
+    def _bump_role_versions(self, permission_id: int):
+        """Invalidate tokens of every role holding the permission (the
+        `pv` claim no longer matches); runs inside the caller's transaction."""
+        role_ids = (
+            db.session.query(role_permissions.c.role_id)
+            .filter(role_permissions.c.permission_id == permission_id)
+        )
+        Role.query.filter(Role.id.in_(role_ids)).update(
+            {Role.permissions_version: Role.permissions_version + 1},
+            synchronize_session=False
+        )
+
     def update(self, permission_id: int, data):
         perm = self.get_by_id(permission_id)
         if not perm:
             return None
+
+        # name / description do not change what a token grants
+        code_changed = any(
+            key in data and data[key] != getattr(perm, key)
+            for key in ("code", "is_deleted")
+        )
         for key, value in data.items():
             if hasattr(perm, key):
                 setattr(perm, key, value)
+        if code_changed:
+            self._bump_role_versions(perm.id)
         db.session.commit()
         return perm
 
@@ -44,6 +67,8 @@ class PermissionRepo(PermissionRepoInterface):
         perm = Permission.query.get(permission_id)
         if not perm:
             return None
+        # before a hard delete removes the role links
+        self._bump_role_versions(perm.id)
         if soft:
             perm.is_deleted = True
         else:
@@ -63,15 +88,35 @@ class PermissionRepo(PermissionRepoInterface):
             Permission.is_deleted == False
         ).all()
 
+    def get_role_permission_codes(self, role_id: int, version: int):
+        """`version` is the role's permissions_version, read with the
+        principal in this request; it is part of the cache key."""
+        codes = permission_cache.get(role_id, version)
+        if codes is not None:
+            return codes
+
+        rows = (
+            db.session.query(Permission.code)
+            .join(role_permissions, role_permissions.c.permission_id == Permission.id)
+            .filter(role_permissions.c.role_id == role_id)
+            .all()
+        )
+        codes = frozenset(code for (code,) in rows)
+        permission_cache.put(role_id, version, codes)
+        return codes
+
     def user_has(self, user_id: int, perm_code: str) -> bool:
-        user = User.query.options(
-            joinedload(User.role).joinedload(Role.permissions)
-        ).filter_by(id=user_id, is_deleted=False).first()
+        scoped = get_token_scope(user_id)
+        if scoped is not None:
+            return perm_code in scoped
 
-        if not user or not user.role:
+        # the request principal is already in the identity map -> no query
+        user = db.session.get(User, user_id)
+
+        if not user or user.is_deleted or not user.role:
             return False
 
-        return any(perm.code == perm_code for perm in user.role.permissions)
+        return perm_code in self.get_role_permission_codes(user.role_id, user.role.permissions_version)
     
     def has_permission(self, user_id: int, permission_code: str) -> bool:
        
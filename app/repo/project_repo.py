@@ -1,17 +1,52 @@
 from app.models.project import Project
+from app.models.intern_project import InternProject
+from app.repo.rating_summary_repo import RatingSummaryRepo
 from app.db.db import db
+from sqlalchemy import func
+from app.utils.dashboard_cache import mark_dashboard_dirty
+from app.utils.report_cache import bump_report_data_version
 from app.repo.base_repo import BaseRepo
 from app.interfaces.project_port import ProjectRepoInterface
 from datetime import datetime
 
 class ProjectRepo(BaseRepo, ProjectRepoInterface):
 
+    def with_stats(self, query):
+        """Outer-join a Project query to grouped rating / intern-count subqueries."""
+        ratings = RatingSummaryRepo().project_rating_subquery()
+
+        intern_counts = (
+            db.session.query(
+                InternProject.project_id.label("project_id"),
+                func.count().label("intern_count")
+            )
+            .group_by(InternProject.project_id)
+            .subquery()
+        )
+
+        return (
+            query
+            .outerjoin(ratings, ratings.c.project_id == Project.id)
+            .outerjoin(intern_counts, intern_counts.c.project_id == Project.id)
+            .add_columns(ratings.c.score_sum, ratings.c.score_count, intern_counts.c.intern_count)
+        )
+
+    def fetch_with_stats(self, query):
+        projects = []
+        for project, score_sum, score_count, intern_count in self.with_stats(query).all():
+            avg_rating = score_sum / score_count if score_count else None
+            project.set_stats(score_count, avg_rating, intern_count or 0)
+            projects.append(project)
+        return projects
+
     def get_all(self):
-        return Project.query.filter_by(is_deleted=False).all()
+        return self.fetch_with_stats(Project.query.filter_by(is_deleted=False).order_by(Project.id))
 
     def get_by_id(self, project_id):
-        project = Project.query.get(project_id)
-        return project if project and not project.is_deleted else None
+        projects = self.fetch_with_stats(
+            Project.query.filter(Project.id == project_id, Project.is_deleted == False)
+        )
+        return projects[0] if projects else None
 
     def get_by_title(self, title):
         return Project.query.filter_by(title=title, is_deleted=False).first()
@@ -20,6 +55,9 @@ class ProjectRepo(BaseRepo, ProjectRepoInterface):
         project = Project(**data)
         db.session.add(project)
         db.session.commit()
+        mark_dashboard_dirty()
+        bump_report_data_version()
+        project.set_stats(0, None, 0)
         return project
 
     def update(self, project_id, data):
@@ -32,6 +70,8 @@ class ProjectRepo(BaseRepo, ProjectRepoInterface):
                 setattr(project, key, value)
 
         db.session.commit()
+        mark_dashboard_dirty()
+        bump_report_data_version()
         return project
 
     def delete(self, project_id, soft=True):
@@ -45,6 +85,8 @@ class ProjectRepo(BaseRepo, ProjectRepoInterface):
             db.session.delete(project)
 
         db.session.commit()
+        mark_dashboard_dirty()
+        bump_report_data_version()
         return True
 
     def get_overview(self):
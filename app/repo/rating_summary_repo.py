@@ -0,0 +1,173 @@
+from app.db.db import db
+from app.models.feedback import Feedback
+from app.models.rating_summary import InternRatingSummary, ProjectRatingSummary
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from app.utils.report_cache import bump_report_data_version
+
+
+class RatingSummaryRepo:
+    """Maintains intern/project rating summaries inside the caller's transaction.
+
+    None of the write methods commit: FeedbackRepo calls them before its own
+    commit so the feedback row and the summary change land atomically.
+    """
+
+    @staticmethod
+    def snapshot(fb):
+        if fb is None:
+            return None
+        return {
+            "type": fb.type.value if hasattr(fb.type, "value") else fb.type,
+            "to_intern_id": fb.to_intern_id,
+            "to_project_id": fb.to_project_id,
+            "score": fb.score,
+            "is_deleted": bool(fb.is_deleted),
+        }
+
+    def record_change(self, before, after):
+        """Apply the difference between two feedback snapshots (either may be None)."""
+        for state, sign in ((before, -1), (after, 1)):
+            if not state or state["is_deleted"] or state["score"] is None:
+                continue
+
+            if state["to_intern_id"]:
+                self._apply(InternRatingSummary, "intern_id", state["to_intern_id"], state, sign)
+
+            if state["to_project_id"]:
+                self._apply(ProjectRatingSummary, "project_id", state["to_project_id"], state, sign)
+
+    def _get_for_update(self, model, key_name, key_value, feedback_type):
+        row = (
+            model.query
+            .filter_by(**{key_name: key_value, "feedback_type": feedback_type})
+            .with_for_update()
+            .first()
+        )
+        if row:
+            return row
+
+        try:
+            with db.session.begin_nested():
+                row = model(**{
+                    key_name: key_value,
+                    "feedback_type": feedback_type,
+                    "score_sum": 0,
+                    "score_count": 0,
+                    "histogram": {},
+                })
+                db.session.add(row)
+            return row
+        except IntegrityError:
+            # created concurrently by another transaction
+            return (
+                model.query
+                .filter_by(**{key_name: key_value, "feedback_type": feedback_type})
+                .with_for_update()
+                .first()
+            )
+
+    def _apply(self, model, key_name, key_value, state, sign):
+        row = self._get_for_update(model, key_name, key_value, state["type"])
+
+        score = int(state["score"])
+        row.score_sum = (row.score_sum or 0) + sign * score
+        row.score_count = (row.score_count or 0) + sign
+
+        histogram = dict(row.histogram or {})
+        bucket = str(score)
+        histogram[bucket] = histogram.get(bucket, 0) + sign
+        if histogram[bucket] <= 0:
+            del histogram[bucket]
+        row.histogram = histogram
+
+    def rebuild(self):
+        """Recompute every summary row from the feedbacks table (backfill)."""
+        InternRatingSummary.query.delete()
+        ProjectRatingSummary.query.delete()
+
+        targets = (
+            (InternRatingSummary, "intern_id", Feedback.to_intern_id),
+            (ProjectRatingSummary, "project_id", Feedback.to_project_id),
+        )
+
+        total = 0
+        for model, key_name, column in targets:
+            rows = (
+                db.session.query(column, Feedback.type, Feedback.score, func.count(Feedback.id))
+                .filter(column.isnot(None), Feedback.is_deleted == False, Feedback.score.isnot(None))
+                .group_by(column, Feedback.type, Feedback.score)
+                .all()
+            )
+
+            summaries = {}
+            for key_value, fb_type, score, count in rows:
+                fb_type = fb_type.value if hasattr(fb_type, "value") else fb_type
+                summary = summaries.setdefault((key_value, fb_type), {
+                    key_name: key_value,
+                    "feedback_type": fb_type,
+                    "score_sum": 0,
+                    "score_count": 0,
+                    "histogram": {},
+                })
+                summary["score_sum"] += score * count
+                summary["score_count"] += count
+                summary["histogram"][str(score)] = count
+
+            db.session.add_all(model(**data) for data in summaries.values())
+            total += len(summaries)
+
+        db.session.commit()
+        bump_report_data_version()
+        return total
+
+    def intern_rating_subquery(self, feedback_types=None):
+        # a plain select: needs no session, so it can be built at import time
+        query = select(
+            InternRatingSummary.intern_id.label("intern_id"),
+            func.sum(InternRatingSummary.score_sum).label("score_sum"),
+            func.sum(InternRatingSummary.score_count).label("score_count")
+        )
+        if feedback_types:
+            query = query.where(InternRatingSummary.feedback_type.in_(feedback_types))
+        return query.group_by(InternRatingSummary.intern_id).subquery()
+
+    def project_rating_subquery(self, feedback_types=None):
+        query = select(
+            ProjectRatingSummary.project_id.label("project_id"),
+            func.sum(ProjectRatingSummary.score_sum).label("score_sum"),
+            func.sum(ProjectRatingSummary.score_count).label("score_count")
+        )
+        if feedback_types:
+            query = query.where(ProjectRatingSummary.feedback_type.in_(feedback_types))
+        return query.group_by(ProjectRatingSummary.project_id).subquery()
+
+    def get_intern_ratings(self, feedback_types=None):
+        """{intern_id: (score_sum, score_count)}"""
+        sub = self.intern_rating_subquery(feedback_types)
+        rows = db.session.query(sub.c.intern_id, sub.c.score_sum, sub.c.score_count).all()
+        return {key: (int(s or 0), int(c or 0)) for key, s, c in rows}
+
+    def get_project_ratings(self, feedback_types=None):
+        """{project_id: (score_sum, score_count)}"""
+        sub = self.project_rating_subquery(feedback_types)
+        rows = db.session.query(sub.c.project_id, sub.c.score_sum, sub.c.score_count).all()
+        return {key: (int(s or 0), int(c or 0)) for key, s, c in rows}
+
+    def get_intern_rating(self, intern_id):
+        return db.session.query(
+            func.coalesce(func.sum(InternRatingSummary.score_sum), 0),
+            func.coalesce(func.sum(InternRatingSummary.score_count), 0)
+        ).filter(InternRatingSummary.intern_id == intern_id).one()
+
+    def get_project_rating(self, project_id):
+        return db.session.query(
+            func.coalesce(func.sum(ProjectRatingSummary.score_sum), 0),
+            func.coalesce(func.sum(ProjectRatingSummary.score_count), 0)
+        ).filter(ProjectRatingSummary.project_id == project_id).one()
+
+    def get_histograms(self, model, exclude_types=None):
+        query = db.session.query(model.histogram)
+        if exclude_types:
+            query = query.filter(model.feedback_type.notin_(exclude_types))
+        return [h for (h,) in query.all()]
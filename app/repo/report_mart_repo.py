@@ -0,0 +1,302 @@
+import itertools
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import Date, case, delete, event, func, insert, or_, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.functions import FunctionElement
+
+from app.db.db import db
+from app.models.intern import Intern
+from app.models.project import Project
+from app.models.feedback import Feedback
+from app.models.report_mart import (
+    InternDailyFact, ProjectDailyFact, FeedbackDailyFact, ReportMartDirtyDay
+)
+from app.utils.report_mart import report_mart
+
+
+class utc_day(FunctionElement):
+    """Calendar day of a timestamp, in UTC."""
+    type = Date()
+    name = "utc_day"
+    inherit_cache = True
+
+
+@compiles(utc_day)
+def _utc_day_default(element, compiler, **kw):
+    return "DATE(%s)" % compiler.process(element.clauses, **kw)
+
+
+@compiles(utc_day, "postgresql")
+def _utc_day_postgresql(element, compiler, **kw):
+    return "CAST(timezone('UTC', %s) AS DATE)" % compiler.process(element.clauses, **kw)
+
+
+def _as_day(value):
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if isinstance(value, datetime):
+        if value.tzinfo:
+            value = value.astimezone(timezone.utc)
+        return value.date()
+    return value
+
+
+def _parse_day(value):
+    if not value or not isinstance(value, str) or not value.strip():
+        return None
+    try:
+        return datetime.fromisoformat(value).date()
+    except ValueError as e:
+        print(f"Error parsing report date: {value}, error: {e}")
+        return None
+
+
+def _day_in(column, days):
+    dated = [d for d in days if d is not None]
+    clauses = []
+    if dated:
+        clauses.append(column.in_(dated))
+    if None in days:
+        clauses.append(column.is_(None))
+    return or_(*clauses)
+
+
+def _feedback_target():
+    return case(
+        (Feedback.to_intern_id.isnot(None), "intern"),
+        (Feedback.to_project_id.isnot(None), "project"),
+        else_=None
+    )
+
+
+# (model, fact name, date attribute, value the column default will fill in)
+_TRACKED = (
+    (Intern, "intern", "start_date", date.today),
+    (Project, "project", "start_date", date.today),
+    (Feedback, "feedback", "created_at", lambda: datetime.now(timezone.utc)),
+)
+
+
+def _touched_days(session, obj, attr, default):
+    history = db.inspect(obj).attrs[attr].history
+    days = {_as_day(v) for v in itertools.chain(history.added, history.unchanged, history.deleted)}
+    if obj in session.new and days <= {None}:
+        # filled in by the column default on INSERT
+        days.add(_as_day(default()))
+    return days
+
+
+def _insert_marker(dialect_name):
+    # one marker per (fact, day): a day that is already waiting is not re-added
+    table = ReportMartDirtyDay.__table__
+    if dialect_name == "postgresql":
+        return pg_insert(table).on_conflict_do_nothing()
+    if dialect_name == "sqlite":
+        return sqlite_insert(table).on_conflict_do_nothing()
+    return insert(table)
+
+
+@event.listens_for(Session, "before_flush")
+def _mark_dirty_days(session, flush_context, instances):
+    # the markers are written in the transaction of the change itself, so a
+    # refresh never misses a committed write; nothing is marked while the
+    # mart is off (run --rebuild after turning it on)
+    if not report_mart.enabled:
+        return
+    marked = session.info.setdefault("mart_dirty_days", set())
+    new_markers = []
+
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        for model, fact, attr, default in _TRACKED:
+            if not isinstance(obj, model):
+                continue
+            if obj in session.dirty and not session.is_modified(obj):
+                continue
+
+            for day in _touched_days(session, obj, attr, default):
+                if (fact, day) not in marked:
+                    marked.add((fact, day))
+                    new_markers.append({"fact": fact, "day": day, "created_at": datetime.utcnow()})
+
+    if new_markers:
+        connection = session.connection()
+        connection.execute(_insert_marker(connection.dialect.name), new_markers)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _reset_dirty_days(session):
+    session.info.pop("mart_dirty_days", None)
+
+
+# pg advisory lock key shared by every process that refreshes the mart
+MART_LOCK_KEY = 0x6D617274
+
+
+def _is_postgresql():
+    return db.session.get_bind().dialect.name == "postgresql"
+
+
+class ReportMartRepo:
+
+    # ---------- refresh ----------
+
+    def lock(self, wait=False):
+        """Take the mart refresh lock for the current transaction; released
+        on commit. Returns False if another process holds it (wait=False).
+        Other databases run a single process and always get it."""
+        if not _is_postgresql():
+            return True
+        if wait:
+            db.session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MART_LOCK_KEY})
+            return True
+        return db.session.execute(
+            text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": MART_LOCK_KEY}
+        ).scalar()
+
+    def claim_dirty(self, limit=500):
+        """Oldest dirty markers: ``(ids, {fact: {day, ...}})``."""
+        rows = (
+            db.session.query(ReportMartDirtyDay.id, ReportMartDirtyDay.fact, ReportMartDirtyDay.day)
+            .order_by(ReportMartDirtyDay.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+        days = {}
+        for _, fact, day in rows:
+            days.setdefault(fact, set()).add(day)
+        return [r.id for r in rows], days
+
+    def count_dirty(self):
+        return db.session.query(func.count(ReportMartDirtyDay.id)).scalar()
+
+    def _replace(self, model, columns, select_stmt, days):
+        # keys that no longer have source rows must go; the rest is upserted
+        # on the fact's unique key, so a recount never adds to a stale row
+        if days is not None:
+            db.session.execute(delete(model).where(_day_in(model.day, days)))
+        else:
+            db.session.execute(delete(model))
+
+        if not _is_postgresql():
+            db.session.execute(insert(model).from_select(columns, select_stmt))
+            return
+
+        stmt = pg_insert(model).from_select(columns, select_stmt)
+        count = columns[-1]
+        db.session.execute(stmt.on_conflict_do_update(
+            index_elements=columns[:-1],
+            set_={count: getattr(stmt.excluded, count)}
+        ))
+
+    def refresh_interns(self, days=None):
+        query = (
+            select(Intern.start_date, Intern.major, func.count(Intern.id))
+            .where(Intern.is_deleted == False)
+            .group_by(Intern.start_date, Intern.major)
+        )
+        if days is not None:
+            query = query.where(_day_in(Intern.start_date, days))
+        self._replace(InternDailyFact, ["day", "major", "intern_count"], query, days)
+
+    def refresh_projects(self, days=None):
+        query = (
+            select(Project.start_date, Project.status, func.count(Project.id))
+            .where(Project.is_deleted == False)
+            .group_by(Project.start_date, Project.status)
+        )
+        if days is not None:
+            query = query.where(_day_in(Project.start_date, days))
+        self._replace(ProjectDailyFact, ["day", "status", "project_count"], query, days)
+
+    def refresh_feedback(self, days=None):
+        day = utc_day(Feedback.created_at)
+        scored = select(
+            day.label("day"), _feedback_target().label("target"), Feedback.score
+        ).where(Feedback.is_deleted == False)
+
+        if days is not None:
+            dated = [d for d in days if d is not None]
+            if dated and None not in days:
+                # coarse range first so the created_at index can be used
+                scored = scored.where(
+                    Feedback.created_at >= datetime.combine(min(dated) - timedelta(days=1), datetime.min.time()),
+                    Feedback.created_at < datetime.combine(max(dated) + timedelta(days=2), datetime.min.time()),
+                )
+            scored = scored.where(_day_in(day, days))
+
+        scored = scored.subquery()
+        query = (
+            select(scored.c.day, scored.c.target, scored.c.score, func.count())
+            .group_by(scored.c.day, scored.c.target, scored.c.score)
+        )
+        self._replace(
+            FeedbackDailyFact, ["day", "target", "score", "feedback_count"], query, days
+        )
+
+    def refresh(self, fact, days=None):
+        {
+            "intern": self.refresh_interns,
+            "project": self.refresh_projects,
+            "feedback": self.refresh_feedback,
+        }[fact](days)
+
+    def finish_batch(self, ids):
+        db.session.execute(delete(ReportMartDirtyDay).where(ReportMartDirtyDay.id.in_(ids)))
+        db.session.commit()
+
+    def rebuild(self):
+        """Recompute every fact row from the source tables (backfill)."""
+        self.lock(wait=True)
+        db.session.execute(delete(ReportMartDirtyDay))
+        for fact in ("intern", "project", "feedback"):
+            self.refresh(fact)
+        db.session.commit()
+
+    # ---------- reads ----------
+
+    def _day_range(self, query, column, filters):
+        day_from = _parse_day(filters.get("date_from"))
+        day_to = _parse_day(filters.get("date_to"))
+        if day_from:
+            query = query.filter(column >= day_from)
+        if day_to:
+            query = query.filter(column <= day_to)
+        return query
+
+    def count_interns_by_major(self, filters):
+        """[(major, count)], same shape as ReportRepo.count_interns_by_major."""
+        query = db.session.query(InternDailyFact.major, func.sum(InternDailyFact.intern_count))
+        if filters.get("major"):
+            query = query.filter(InternDailyFact.major == filters["major"])
+        query = self._day_range(query, InternDailyFact.day, filters)
+        return [(major, int(count or 0)) for major, count in query.group_by(InternDailyFact.major).all()]
+
+    def count_projects(self, filters):
+        """(total, completed); like the live query, dates do not apply to projects."""
+        query = db.session.query(
+            func.sum(ProjectDailyFact.project_count),
+            func.sum(ProjectDailyFact.project_count).filter(ProjectDailyFact.status == "done")
+        )
+        if filters.get("status"):
+            query = query.filter(ProjectDailyFact.status == filters["status"])
+        total, completed = query.one()
+        return int(total or 0), int(completed or 0)
+
+    def count_feedback_by_score(self, filters):
+        """[(target, score, count)] over the day range."""
+        query = db.session.query(
+            FeedbackDailyFact.target, FeedbackDailyFact.score, func.sum(FeedbackDailyFact.feedback_count)
+        )
+        query = self._day_range(query, FeedbackDailyFact.day, filters)
+        rows = query.group_by(FeedbackDailyFact.target, FeedbackDailyFact.score).all()
+        return [(target, score, int(count or 0)) for target, score, count in rows]
@@ -0,0 +1,170 @@
+from app.db.db import db
+from app.models.intern import Intern
+from app.models.project import Project
+from app.models.feedback import Feedback
+from app.models.user import User
+from app.repo.rating_summary_repo import RatingSummaryRepo
+from sqlalchemy import func
+
+
+def _date_str(value):
+    return str(value)
+
+
+def _optional_str(value):
+    return str(value) if value else None
+
+
+def _enum_value(value):
+    return value.value if value is not None else None
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+def _rating(value):
+    return round(float(value), 1) if value is not None else 0.0
+
+
+class ReportColumn:
+    """One output column: its name, the SQL expression it is selected from,
+    its value kind ("int", "float", "string", "bool") and an optional
+    conversion applied to the fetched value."""
+
+    __slots__ = ("name", "expr", "kind", "convert")
+
+    def __init__(self, name, expr, kind, convert=None):
+        self.name = name
+        self.expr = expr
+        self.kind = kind
+        self.convert = convert
+
+
+class ReportProjection:
+    """Fixed, typed row layout of one report type.
+
+    The column order, the SELECT list and the per-column conversions are
+    resolved when the projection is built, so rows go from the cursor to
+    the writer as plain sequences without a dict per row.
+    """
+
+    def __init__(self, name, columns, select_from, joins=(), order_by=None):
+        self.name = name
+        self.columns = tuple(columns)
+        self.names = [c.name for c in self.columns]
+        self.kinds = [c.kind for c in self.columns]
+        self.select_from = select_from
+        self.joins = tuple(joins)
+        self.order_by = order_by
+        self._labels = [c.expr.label(c.name) for c in self.columns]
+        self._converters = [(i, c.convert) for i, c in enumerate(self.columns) if c.convert]
+        self._narrowed = {}
+
+    def without(self, *names):
+        """The same projection minus `names` (built once, then reused)."""
+        key = frozenset(names)
+        if key not in self._narrowed:
+            self._narrowed[key] = ReportProjection(
+                self.name,
+                [c for c in self.columns if c.name not in key],
+                self.select_from,
+                self.joins,
+                self.order_by
+            )
+        return self._narrowed[key]
+
+    def query(self):
+        query = db.session.query(*self._labels).select_from(self.select_from)
+        for target, onclause in self.joins:
+            query = query.outerjoin(target, onclause)
+        if self.order_by is not None:
+            query = query.order_by(self.order_by)
+        return query
+
+    def rows(self, result):
+        """Yield each fetched row as a value sequence in column order."""
+        converters = self._converters
+        if not converters:
+            yield from result
+            return
+
+        for row in result:
+            values = list(row)
+            for i, convert in converters:
+                values[i] = convert(values[i])
+            yield values
+
+    def dicts(self, result):
+        names = self.names
+        return [dict(zip(names, values)) for values in self.rows(result)]
+
+
+_project_ratings = RatingSummaryRepo().project_rating_subquery()
+
+# same keys as the models' to_dict(); exports leave out is_deleted
+
+INTERN_PROJECTION = ReportProjection(
+    "intern",
+    [
+        ReportColumn("id", Intern.id, "int"),
+        ReportColumn("name", Intern.name, "string"),
+        ReportColumn("email", Intern.email, "string"),
+        ReportColumn("university", Intern.university, "string"),
+        ReportColumn("major", Intern.major, "string"),
+        ReportColumn("start_date", Intern.start_date, "string", _date_str),
+        ReportColumn("end_date", Intern.end_date, "string", _optional_str),
+        ReportColumn("is_deleted", Intern.is_deleted, "bool"),
+        ReportColumn("user_id", Intern.user_id, "int"),
+    ],
+    select_from=Intern,
+    order_by=Intern.id
+)
+
+PROJECT_PROJECTION = ReportProjection(
+    "project",
+    [
+        ReportColumn("id", Project.id, "int"),
+        ReportColumn("title", Project.title, "string"),
+        ReportColumn("description", Project.description, "string"),
+        ReportColumn("start_date", Project.start_date, "string", _date_str),
+        ReportColumn("end_date", Project.end_date, "string", _optional_str),
+        ReportColumn("status", Project.status, "string"),
+        ReportColumn("is_deleted", Project.is_deleted, "bool"),
+        ReportColumn(
+            "rating",
+            _project_ratings.c.score_sum * 1.0 / func.nullif(_project_ratings.c.score_count, 0),
+            "float",
+            _rating
+        ),
+        ReportColumn("rating_count", func.coalesce(_project_ratings.c.score_count, 0), "int"),
+    ],
+    select_from=Project,
+    joins=[(_project_ratings, _project_ratings.c.project_id == Project.id)],
+    order_by=Project.id
+)
+
+FEEDBACK_PROJECTION = ReportProjection(
+    "feedback",
+    [
+        ReportColumn("id", Feedback.id, "int"),
+        ReportColumn("type", Feedback.type, "string", _enum_value),
+        ReportColumn("score", Feedback.score, "int"),
+        ReportColumn("comment", Feedback.comment, "string"),
+        ReportColumn("from_user_id", Feedback.from_user_id, "int"),
+        ReportColumn("from_user_name", User.username, "string"),
+        ReportColumn("to_intern_id", Feedback.to_intern_id, "int"),
+        ReportColumn("to_project_id", Feedback.to_project_id, "int"),
+        ReportColumn("is_deleted", Feedback.is_deleted, "bool"),
+        ReportColumn("created_at", Feedback.created_at, "string", _isoformat),
+    ],
+    select_from=Feedback,
+    joins=[(User, User.id == Feedback.from_user_id)],
+    order_by=Feedback.id
+)
+
+REPORT_PROJECTIONS = {
+    "intern": INTERN_PROJECTION,
+    "project": PROJECT_PROJECTION,
+    "feedback": FEEDBACK_PROJECTION,
+}
@@ -2,13 +2,29 @@ from app.models.intern import Intern
 from app.models.project import Project
 from app.models.feedback import Feedback
 from app.db.db import db
+from sqlalchemy import case, func
 from datetime import datetime
 
+# rows fetched per round trip when streaming report data
+STREAM_BATCH_SIZE = 1000
+
+
+def _stream(query, batch_size):
+    # yield_per fetches in batches (server-side cursor on PostgreSQL)
+    return query.execution_options(yield_per=batch_size)
+
+
+def _bucket_case(column, buckets):
+    """CASE mapping `column` onto ``[(name, lower_bound), ...]`` (highest
+    first); the last bucket's bound is None and catches everything else."""
+    whens = [(column >= low, name) for name, low in buckets if low is not None]
+    return case(*whens, else_=buckets[-1][0])
+
 
 class ReportRepo:
 
-    def get_interns(self, filters):
-        query = Intern.query.filter_by(is_deleted=False)
+    def _filter_interns(self, query, filters):
+        query = query.filter(Intern.is_deleted == False)
 
         if filters.get("major"):
             query = query.filter(Intern.major == filters["major"])
@@ -29,10 +45,10 @@ class ReportRepo:
             except (ValueError, TypeError, AttributeError) as e:
                 print(f"Error parsing date_to: {date_to}, error: {e}")
 
-        return query.all()
+        return query
 
-    def get_projects(self, filters):
-        query = Project.query.filter_by(is_deleted=False)
+    def _filter_projects(self, query, filters):
+        query = query.filter(Project.is_deleted == False)
 
         if filters.get("status"):
             query = query.filter(Project.status == filters["status"])
@@ -51,10 +67,10 @@ class ReportRepo:
             except (ValueError, TypeError):
                 pass
 
-        return query.all()
+        return query
 
-    def get_feedback(self, filters):
-        query = Feedback.query.filter_by(is_deleted=False)
+    def _filter_feedback(self, query, filters):
+        query = query.filter(Feedback.is_deleted == False)
         if filters.get("intern_id"):
             query = query.filter(Feedback.to_intern_id == filters["intern_id"])
         if filters.get("project_id"):
@@ -74,8 +90,74 @@ class ReportRepo:
             except (ValueError, TypeError):
                 pass
 
-        return query.all()
-    
+        return query
+
+    def _projected_query(self, projection, filters):
+        filter_query = {
+            "intern": self._filter_interns,
+            "project": self._filter_projects,
+            "feedback": self._filter_feedback,
+        }[projection.name]
+        return filter_query(projection.query(), filters)
+
+    def stream(self, projection, filters, batch_size=STREAM_BATCH_SIZE):
+        """Filtered rows of `projection` as value sequences, fetched in batches."""
+        return projection.rows(_stream(self._projected_query(projection, filters), batch_size))
+
+    def list_dicts(self, projection, filters):
+        return projection.dicts(self._projected_query(projection, filters).all())
+
+    def count_interns_by_major(self, filters):
+        """[(major, count)] for the filtered interns."""
+        query = self._filter_interns(
+            db.session.query(Intern.major, func.count(Intern.id)), filters
+        )
+        return query.group_by(Intern.major).all()
+
+    def count_projects(self, filters):
+        """(total, completed) for the filtered projects, in one scan."""
+        query = self._filter_projects(
+            db.session.query(
+                func.count(Project.id),
+                func.count(Project.id).filter(Project.status == "done")
+            ),
+            filters
+        )
+        total, completed = query.one()
+        return total or 0, completed or 0
+
+    def count_feedback_by_bucket(self, filters, intern_buckets, project_buckets):
+        """[(target, bucket, count, score_sum)] for the filtered feedback.
+
+        target is "intern" when the feedback is about an intern, "project"
+        when it is only about a project and None otherwise; the bucket comes
+        from the matching bucket list.
+        """
+        target = case(
+            (Feedback.to_intern_id.isnot(None), "intern"),
+            (Feedback.to_project_id.isnot(None), "project"),
+            else_=None
+        ).label("target")
+        bucket = case(
+            (Feedback.to_intern_id.isnot(None), _bucket_case(Feedback.score, intern_buckets)),
+            else_=_bucket_case(Feedback.score, project_buckets)
+        ).label("bucket")
+
+        # bucketed in a subquery so GROUP BY refers to plain columns rather
+        # than repeating the CASE expressions (and their bind parameters)
+        scored = self._filter_feedback(
+            db.session.query(target, bucket, Feedback.score), filters
+        ).subquery()
+
+        return (
+            db.session.query(
+                scored.c.target, scored.c.bucket,
+                func.count(), func.sum(scored.c.score)
+            )
+            .group_by(scored.c.target, scored.c.bucket)
+            .all()
+        )
+
     def get_distinct_majors(self):
         q = db.session.query(Intern.major).distinct().all()
         return [m[0] for m in q if m[0]]
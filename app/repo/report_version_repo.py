@@ -0,0 +1,37 @@
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from app.db.db import db
+from app.models.report_data_version import ReportDataVersion
+
+VERSION_ROW_ID = 1
+
+
+class ReportVersionRepo:
+    """The bump runs on its own short connection, after the write it
+    follows has committed, so the counter row is never held for long."""
+
+    def current(self):
+        version = db.session.execute(
+            select(ReportDataVersion.version).where(ReportDataVersion.id == VERSION_ROW_ID)
+        ).scalar()
+        return version or 0
+
+    def bump(self):
+        table = ReportDataVersion.__table__
+        with db.engine.begin() as conn:
+            version = conn.execute(
+                update(table)
+                .where(table.c.id == VERSION_ROW_ID)
+                .values(version=table.c.version + 1)
+                .returning(table.c.version)
+            ).scalar()
+        if version is not None:
+            return version
+
+        try:
+            with db.engine.begin() as conn:
+                conn.execute(insert(table).values(id=VERSION_ROW_ID, version=1))
+            return 1
+        except IntegrityError:
+            # another process created the row first
+            return self.bump()
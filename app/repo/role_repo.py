@@ -38,6 +38,11 @@ class RoleRepo(RoleRepoInterface):
                 if hasattr(role, key):
                     setattr(role, key, value)
 
+            # a rename must not log out every holder of the role
+            touches_permissions = "permissions" in data or "is_deleted" in data
+            if touches_permissions:
+                role.permissions_version = (role.permissions_version or 0) + 1
+
             db.session.commit()
             return role
         except Exception as e:
@@ -52,6 +57,7 @@ class RoleRepo(RoleRepoInterface):
 
             if soft:
                 role.is_deleted = True
+                role.permissions_version = (role.permissions_version or 0) + 1
             else:
                 db.session.delete(role)
 
@@ -74,6 +80,7 @@ class RoleRepo(RoleRepoInterface):
             if permission in role.permissions:
                 return role
             role.permissions.append(permission)
+            role.permissions_version = (role.permissions_version or 0) + 1
             db.session.commit()
             return role 
         except Exception as e:
@@ -92,6 +99,7 @@ class RoleRepo(RoleRepoInterface):
             if permission not in role.permissions:
                 return role
             role.permissions.remove(permission)
+            role.permissions_version = (role.permissions_version or 0) + 1
             db.session.commit()
             return role
         except Exception as e:
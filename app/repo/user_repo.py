@@ -20,6 +20,34 @@ class UserRepo(BaseRepo, UserRepoInterface):
             .first()
         )
 
+    def get_principal(self, user_id, with_permissions=True):
+        """Load an active user with role (and permissions) in one query (auth path)."""
+        query = User.query
+        if with_permissions:
+            query = query.options(joinedload(User.role).joinedload(Role.permissions))
+
+        return (
+            query
+            .filter(
+                User.id == user_id,
+                User.is_deleted == False,
+                User.is_active == True
+            )
+            .first()
+        )
+
+    def get_ids_by_role(self, role_code):
+        rows = (
+            db.session.query(User.id)
+            .join(Role, Role.id == User.role_id)
+            .filter(
+                Role.code == role_code,
+                User.is_deleted == False,
+                User.is_active == True
+            )
+            .all()
+        )
+        return [r.id for r in rows]
 
     def get_by_email(self, email):
         return User.query.filter_by(email=email, is_deleted=False).first()
@@ -73,7 +101,7 @@ class UserRepo(BaseRepo, UserRepoInterface):
 
             db.session.commit()
             print(f"User {user.username} changes committed")
-            
+
             db.session.refresh(user)
             
             return user
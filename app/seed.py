@@ -11,6 +11,7 @@ from app.models.training_plan import TrainingPlan
 from app.models.feedback import Feedback, FeedbackType
 from app.models.activitylog import ActivityLog
 from app.models.intern_project import InternProject
+from app.repo.rating_summary_repo import RatingSummaryRepo
 from werkzeug.security import generate_password_hash
 from sqlalchemy import text
 
@@ -182,6 +183,7 @@ def seed():
         )
 
     db.session.commit()
+    RatingSummaryRepo().rebuild()
 
     # ✅ TRAINING PLAN TEMPLATES - Sử dụng JSON
     tp_templates = [
@@ -1,14 +1,43 @@
 from app.repo.activitylog_repo import ActivityLogRepo
+from app.utils.exception import BadRequest
+from app.utils.activity_log_writer import activity_log_writer
+from app.utils.cursor import encode_cursor, decode_cursor, parse_limit
+from datetime import datetime
+import json
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def _parse_time(value, field):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise BadRequest(f"Invalid {field}, expected ISO 8601")
+
+
+def _row_to_dict(row):
+    return {
+        "id": row.id,
+        "user_id": row.user_id,
+        "username": row.username,
+        "action": row.action,
+        "details": row.details,
+        "timestamp": row.timestamp.isoformat() if row.timestamp else None
+    }
 
 
 class ActivityLogUC:
 
-    def __init__(self, activitylog_repo=None):
+    def __init__(self, activitylog_repo=None, writer=None):
         self.activitylog_repo = activitylog_repo or ActivityLogRepo()
+        self.writer = writer or activity_log_writer
 
     def log_action(self, user_id, action, details):
-        log = self.activitylog_repo.quick_log(user_id, action, details)
-        return log.to_dict()
+        # queued for a bulk INSERT instead of a commit on the request session
+        return self.writer.enqueue(user_id, action, details)
 
     def get_logs_by_user(self, user_id):
         logs = self.activitylog_repo.get_by_user(user_id)
@@ -19,6 +48,36 @@ class ActivityLogUC:
         return [l.to_dict() for l in logs]
 
 
+    def parse_filters(self, args):
+        user_id = args.get("user_id")
+        if user_id:
+            try:
+                user_id = int(user_id)
+            except ValueError:
+                raise BadRequest("Invalid user_id")
+
+        return {
+            "user_id": user_id or None,
+            "action": args.get("action") or None,
+            "from_time": _parse_time(args.get("from"), "from"),
+            "to_time": _parse_time(args.get("to"), "to")
+        }
+
+    def list_logs(self, filters, cursor=None, limit=None):
+        limit = parse_limit(limit, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+
+        after = decode_cursor(cursor) if cursor else None
+        rows, has_more = self.activitylog_repo.get_page(filters, after, limit)
+
+        return {
+            "items": [_row_to_dict(r) for r in rows],
+            "next_cursor": encode_cursor(rows[-1].timestamp, rows[-1].id) if has_more else None
+        }
+
+    def export_ndjson(self, filters):
+        for row in self.activitylog_repo.iter_filtered(filters):
+            yield json.dumps(_row_to_dict(row), ensure_ascii=False) + "\n"
+
     def get_logs_by_action(self, action):
         logs = self.activitylog_repo.get_by_action(action)
         return [l.to_dict() for l in logs]
@@ -3,7 +3,7 @@ from datetime import datetime, timedelta, timezone
 from app.repo.user_repo import UserRepo
 from app.repo.permission_repo import PermissionRepo
 from app.usecase.activitylog_uc import ActivityLogUC
-from app.utils.mail_service import MailService
+from app.utils.notification_service import NotificationService
 from app.utils.token_service import create_access_token
 from app.utils.exception import BadRequest, PermissionDenied
 
@@ -20,12 +20,12 @@ class AuthUC:
         user_repo: UserRepo | None = None,
         permission_repo: PermissionRepo | None = None,
         activitylog_uc: ActivityLogUC | None = None,
-        mail_service: MailService | None = None,
+        notification_service: NotificationService | None = None,
     ):
         self.user_repo = user_repo or UserRepo()
         self.permission_repo = permission_repo or PermissionRepo()
         self.activitylog_uc = activitylog_uc or ActivityLogUC()
-        self.mail_service = mail_service or MailService()
+        self.notification_service = notification_service or NotificationService()
 
     def _get_user_by_identifier(self, identifier: str):
         user = self.user_repo.get_by_username(identifier)
@@ -70,7 +70,8 @@ class AuthUC:
                         f"after too many failed login attempts.\n"
                         "If this was not you, please contact your administrator."
                     )
-                    self.mail_service.send_mail(user.email, subject, body)
+                    # committed together with the lockout below
+                    self.notification_service.send_mail(user.email, subject, body, commit=False)
 
             db.session.commit()
             raise BadRequest("Invalid username/email or password")
@@ -88,7 +89,9 @@ class AuthUC:
         token = create_access_token(
             user_id=user.id,
             username=user.username,
-            permissions=user.permission_codes
+            permissions=user.permission_codes,
+            role_id=user.role_id,
+            permissions_version=user.permissions_version
         )
     
         role_code = user.role.code if user.role else None
@@ -5,7 +5,7 @@ from app.repo.intern_repo import InternRepo
 from app.repo.project_repo import ProjectRepo
 from app.repo.user_repo import UserRepo
 from app.repo.permission_repo import PermissionRepo
-from app.utils.mail_service import MailService
+from app.db.db import db
 from app.models.feedback import FeedbackType
 from app.utils.notification_service import NotificationService
 
@@ -18,20 +18,19 @@ class FeedbackUC:
         intern_repo=None,
         project_repo=None,
         user_repo=None,
-        mail_service=None,
-        permission_repo=None
+        permission_repo=None,
+        notification_service=None
     ):
         self.feedback_repo = feedback_repo or FeedbackRepo()
         self.notification_repo = notification_repo or NotificationRepo()
         self.intern_repo = intern_repo or InternRepo()
         self.project_repo = project_repo or ProjectRepo()
         self.user_repo = user_repo or UserRepo()
-        self.mail_service = mail_service or MailService()
         self.permission_repo = permission_repo or PermissionRepo()
 
-        self.notifier = NotificationService(
-            notification_repo=self.notification_repo,
-            mail_service=self.mail_service
+        # intents are staged before the feedback write, whose commit carries them
+        self.notifier = notification_service or NotificationService(
+            notification_repo=self.notification_repo
         )
 
     def get_all_feedback(self):
@@ -57,23 +56,7 @@ class FeedbackUC:
             raise ValueError("Intern not found")
 
         existing = self.feedback_repo.get_by_user_and_intern(user_id, intern_id)
-
-        if existing:
-            fb = self.feedback_repo.update(existing.id, {
-                "score": score,
-                "comment": comment
-            })
-            created = False
-        else:
-            fb = self.feedback_repo.create({
-                "from_user_id": user_id,
-                "to_intern_id": intern_id,
-                "score": score,
-                "comment": comment,
-                "type": FeedbackType.TRAINER_INTERN,
-                "created_at": datetime.utcnow()
-            })
-            created = True
+        created = existing is None
 
         # Notify intern
         if intern.user_id:
@@ -90,7 +73,8 @@ class FeedbackUC:
                 message=message,
                 type="FEEDBACK_INTERN",
                 link_url="/feedbacks",
-                send_email=True
+                send_email=True,
+                commit=False
             )
 
         # Notify mentor (self notify)
@@ -100,9 +84,25 @@ class FeedbackUC:
             message=f"You evaluated intern {intern.name} with {score}/10.",
             type="FEEDBACK_SELF",
             link_url="/feedbacks",
-            send_email=False
+            send_email=False,
+            commit=False
         )
 
+        if existing:
+            fb = self.feedback_repo.update(existing.id, {
+                "score": score,
+                "comment": comment
+            })
+        else:
+            fb = self.feedback_repo.create({
+                "from_user_id": user_id,
+                "to_intern_id": intern_id,
+                "score": score,
+                "comment": comment,
+                "type": FeedbackType.TRAINER_INTERN,
+                "created_at": datetime.utcnow()
+            })
+
         return fb.to_dict()
 
     def intern_give_feedback_to_project(self, user_id: int, data: dict):
@@ -126,24 +126,7 @@ class FeedbackUC:
             raise ValueError("Project not found")
 
         existing = self.feedback_repo.get_by_user_and_project(user_id, project_id)
-
-        if existing:
-            fb = self.feedback_repo.update(existing.id, {
-                "score": score,
-                "comment": comment,
-            })
-            created = False
-        else:
-            fb = self.feedback_repo.create({
-                "from_user_id": user_id,
-                "to_intern_id": intern.id,
-                "to_project_id": project_id,
-                "score": score,
-                "comment": comment,
-                "type": FeedbackType.INTERN_PROJECT,
-                "created_at": datetime.utcnow()
-            })
-            created = True
+        created = existing is None
 
         receivers = set()
 
@@ -156,15 +139,15 @@ class FeedbackUC:
         title = "New Feedback on Project" if created else "Project Feedback Updated"
         message = f"{intern.name} rated project '{project.title}' {score}/10."
 
-        for uid in receivers:
-            self.notifier.notify_user(
-                user_id=uid,
-                title=title,
-                message=message,
-                type="FEEDBACK_PROJECT",
-                link_url=f"/projects/{project_id}",
-                send_email=True
-            )
+        self.notifier.notify_many(
+            receivers,
+            title=title,
+            message=message,
+            type="FEEDBACK_PROJECT",
+            link_url=f"/projects/{project_id}",
+            send_email=True,
+            commit=False
+        )
 
         # Self notify
         self.notifier.notify_user(
@@ -173,9 +156,26 @@ class FeedbackUC:
             message=f"You rated project '{project.title}' {score}/10.",
             type="FEEDBACK_SELF",
             link_url=f"/projects/{project_id}",
-            send_email=False
+            send_email=False,
+            commit=False
         )
 
+        if existing:
+            fb = self.feedback_repo.update(existing.id, {
+                "score": score,
+                "comment": comment,
+            })
+        else:
+            fb = self.feedback_repo.create({
+                "from_user_id": user_id,
+                "to_intern_id": intern.id,
+                "to_project_id": project_id,
+                "score": score,
+                "comment": comment,
+                "type": FeedbackType.INTERN_PROJECT,
+                "created_at": datetime.utcnow()
+            })
+
         return fb.to_dict()
 
     def mentor_give_feedback_to_project(self, mentor_id: int, data: dict):
@@ -191,16 +191,6 @@ class FeedbackUC:
             raise ValueError("score is required")
 
         project = self.project_repo.get_by_id(project_id)
-
-        fb = self.feedback_repo.create({
-            "from_user_id": mentor_id,
-            "to_project_id": project_id,
-            "score": score,
-            "comment": comment,
-            "type": FeedbackType.TRAINER_PROJECT,
-            "created_at": datetime.utcnow()
-        })
-
         mentor = self.user_repo.get_by_id(mentor_id)
 
         receivers = set()
@@ -214,15 +204,15 @@ class FeedbackUC:
         title = "New Project Evaluation"
         message = f"{mentor.username} evaluated project '{project.title}' with {score}/10."
 
-        for uid in receivers:
-            self.notifier.notify_user(
-                user_id=uid,
-                title=title,
-                message=message,
-                type="FEEDBACK_PROJECT",
-                link_url=f"/projects/{project_id}",
-                send_email=True
-            )
+        self.notifier.notify_many(
+            receivers,
+            title=title,
+            message=message,
+            type="FEEDBACK_PROJECT",
+            link_url=f"/projects/{project_id}",
+            send_email=True,
+            commit=False
+        )
 
         # Self notify
         self.notifier.notify_user(
@@ -231,9 +221,19 @@ class FeedbackUC:
             message=f"You evaluated project '{project.title}' with {score}/10.",
             type="FEEDBACK_SELF",
             link_url=f"/projects/{project_id}",
-            send_email=False
+            send_email=False,
+            commit=False
         )
 
+        fb = self.feedback_repo.create({
+            "from_user_id": mentor_id,
+            "to_project_id": project_id,
+            "score": score,
+            "comment": comment,
+            "type": FeedbackType.TRAINER_PROJECT,
+            "created_at": datetime.utcnow()
+        })
+
         return fb.to_dict()
 
     def get_feedback_for_intern(self, requester_id: int, intern_id: int):
@@ -251,19 +251,17 @@ class FeedbackUC:
         if fb.from_user_id != user_id:
             raise PermissionError("You can only update your own feedback")
 
-        updated = self.feedback_repo.update(feedback_id, data)
-
-        targets = self._get_feedback_target_user_ids(updated)
+        targets = self._get_feedback_target_user_ids(fb)
 
-        for uid in targets:
-            self.notifier.notify_user(
-                user_id=uid,
-                title="Feedback Updated",
-                message="A feedback related to you has been updated.",
-                type="FEEDBACK_UPDATE",
-                link_url="/feedbacks",
-                send_email=True
-            )
+        self.notifier.notify_many(
+            targets,
+            title="Feedback Updated",
+            message="A feedback related to you has been updated.",
+            type="FEEDBACK_UPDATE",
+            link_url="/feedbacks",
+            send_email=True,
+            commit=False
+        )
 
         self.notifier.notify_user(
             user_id=user_id,
@@ -271,9 +269,12 @@ class FeedbackUC:
             message="You updated your feedback.",
             type="FEEDBACK_SELF",
             link_url="/feedbacks",
-            send_email=False
+            send_email=False,
+            commit=False
         )
 
+        updated = self.feedback_repo.update(feedback_id, data)
+
         return updated.to_dict()
 
     def delete_feedback(self, user_id: int, feedback_id: int):
@@ -286,27 +287,29 @@ class FeedbackUC:
 
         targets = self._get_feedback_target_user_ids(fb)
 
-        deleted = self.feedback_repo.soft_delete(feedback_id)
+        self.notifier.notify_many(
+            targets,
+            title="Feedback Deleted",
+            message="A feedback related to you has been removed.",
+            type="FEEDBACK_DELETE",
+            link_url="/feedbacks",
+            send_email=True,
+            commit=False
+        )
 
-        if deleted:
-            for uid in targets:
-                self.notifier.notify_user(
-                    user_id=uid,
-                    title="Feedback Deleted",
-                    message="A feedback related to you has been removed.",
-                    type="FEEDBACK_DELETE",
-                    link_url="/feedbacks",
-                    send_email=True
-                )
+        self.notifier.notify_user(
+            user_id=user_id,
+            title="Feedback Deleted",
+            message="You removed a feedback.",
+            type="FEEDBACK_SELF",
+            link_url="/feedbacks",
+            send_email=False,
+            commit=False
+        )
 
-            self.notifier.notify_user(
-                user_id=user_id,
-                title="Feedback Deleted",
-                message="You removed a feedback.",
-                type="FEEDBACK_SELF",
-                link_url="/feedbacks",
-                send_email=False
-            )
+        deleted = self.feedback_repo.soft_delete(feedback_id)
+        if not deleted:
+            db.session.rollback()
 
         return True if deleted else False
 
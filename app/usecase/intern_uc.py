@@ -6,7 +6,7 @@ from app.repo.user_repo import UserRepo
 from app.repo.permission_repo import PermissionRepo
 from app.usecase.activitylog_uc import ActivityLogUC
 from app.utils.exception import NotFound, BadRequest
-from app.utils.mail_service import MailService
+from app.utils.notification_service import NotificationService
 
 EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
 
@@ -19,13 +19,13 @@ class InternUC:
         user_repo=None,
         permission_repo=None,
         activitylog_uc=None,
-        mail_service=None
+        notification_service=None
     ):
         self.intern_repo = intern_repo or InternRepo()
         self.user_repo = user_repo or UserRepo()
         self.permission_repo = permission_repo or PermissionRepo()
         self.activitylog_uc = activitylog_uc or ActivityLogUC()
-        self.mail_service = mail_service or MailService()
+        self.notification_service = notification_service or NotificationService()
 
     def _validate_email(self, email):
         if not EMAIL_RE.match(email):
@@ -60,6 +60,18 @@ class InternUC:
             if existed:
                 raise BadRequest("This user is already linked to another intern")
 
+            # staged here so the intern insert commits the mail intent with it
+            self.notification_service.send_mail(
+                user.email,
+                "Your Internship Account",
+                f"Hello {name},\n\n"
+                "Your Mini ERP account is ready.\n\n"
+                f"Username: {user.username}\n"
+                f"Email: {user.email}\n\n"
+                "Please login and update your password.\n",
+                commit=False
+            )
+
         intern = self.intern_repo.create({
             "name": name,
             "email": email,
@@ -74,25 +86,12 @@ class InternUC:
             details=f"Created intern {intern.name}"
         )
 
-        if user_link_id:
-            user = self.user_repo.get_by_id(user_link_id)
-            self.mail_service.send_mail(
-                user.email,
-                "Your Internship Account",
-                f"Hello {intern.name},\n\n"
-                "Your Mini ERP account is ready.\n\n"
-                f"Username: {user.username}\n"
-                f"Email: {user.email}\n\n"
-                "Please login and update your password.\n"
-                )
-            
-
         return intern.to_dict(with_counts=True)
 
     def update_intern(self, user_id, intern_id, data):
         self.permission_repo.ensure(user_id, "INTERN_UPDATE")
 
-        intern = self.intern_repo.get_by_id(intern_id)
+        intern = self.intern_repo.get_by_id_with_counts(intern_id)
         if not intern:
             raise NotFound("Intern not found")
 
@@ -144,12 +143,12 @@ class InternUC:
 
     def get_all_interns(self, user_id):
         self.permission_repo.ensure(user_id, "INTERN_VIEW")
-        interns = self.intern_repo.get_all()
+        interns = self.intern_repo.get_all_with_counts()
         return [i.to_dict(with_counts=True) for i in interns]
 
     def get_intern_by_id(self, user_id, intern_id):
         self.permission_repo.ensure(user_id, "INTERN_VIEW")
-        intern = self.intern_repo.get_by_id(intern_id)
+        intern = self.intern_repo.get_by_id_with_counts(intern_id)
 
         if not intern:
             raise NotFound("Intern not found")
@@ -174,7 +173,7 @@ class InternUC:
     def close_internship(self, user_id, intern_id):
         self.permission_repo.ensure(user_id, "INTERN_UPDATE")
 
-        intern = self.intern_repo.get_by_id(intern_id)
+        intern = self.intern_repo.get_by_id_with_counts(intern_id)
         if not intern:
             raise NotFound("Intern not found")
 
@@ -1,13 +1,119 @@
 from app.repo.notification_repo import NotificationRepo
+from app.utils.cursor import encode_cursor, decode_cursor, parse_limit
+from app.utils.notification_hub import notification_hub
+import json
+import time
+from flask import current_app
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+REPLAY_LIMIT = 100
+# ids remembered per stream to skip events seen both live and by polling
+STREAM_SENT_IDS = 1000
+
+
+def _sse(event):
+    return f"id: {event['id']}\nevent: notification\ndata: {json.dumps(event)}\n\n"
 
 
 class NotificationUC:
-    def __init__(self, notification_repo: NotificationRepo | None = None):
+    def __init__(self, notification_repo: NotificationRepo | None = None, hub=None):
         self.notification_repo = notification_repo or NotificationRepo()
+        self.hub = hub or notification_hub
+
+    def list_for_user(self, user_id: int, only_unread: bool = False, cursor=None, limit=None):
+        limit = parse_limit(limit, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+        after = decode_cursor(cursor) if cursor else None
+
+        items, has_more = self.notification_repo.get_page(user_id, only_unread, after, limit)
+        last = items[-1] if items else None
+
+        return {
+            "items": [n.to_dict() for n in items],
+            "next_cursor": encode_cursor(last.created_at, last.id) if has_more else None
+        }
+
+    def open_stream(self, user_id: int, last_event_id=None, heartbeat_seconds=15, poll_seconds=5):
+        """Subscribe first, then replay anything after `last_event_id`, so no
+        notification falls between the two. Returns an SSE line generator;
+        raises TooManyConnections when the worker is full.
+
+        The hub only sees notifications dispatched by this worker; every
+        `poll_seconds` the stream also reads newer rows from the table, which
+        covers the other workers (0 turns polling off: single worker only).
+        Each poll runs in its own short app context, so the open stream does
+        not hold a pooled connection."""
+        try:
+            last_id = int(last_event_id) if last_event_id else None
+        except ValueError:
+            last_id = None
+
+        hub = self.hub
+        notification_repo = self.notification_repo
+        app = current_app._get_current_object()
+
+        def poll(after_id):
+            with app.app_context():
+                return [n.to_dict() for n in notification_repo.get_since(user_id, after_id, REPLAY_LIMIT)]
+
+        def stream():
+            sub = hub.subscribe(user_id)
+            try:
+                backlog = []
+                if last_id is not None:
+                    backlog = [
+                        n.to_dict()
+                        for n in notification_repo.get_since(user_id, last_id, REPLAY_LIMIT)
+                    ]
+                    polled_to = backlog[-1]["id"] if backlog else last_id
+                else:
+                    polled_to = notification_repo.latest_id(user_id)
+                # ids already written to this stream; trimmed to the newest
+                sent = {event["id"] for event in backlog}
+
+                # primed up to here by open_stream
+                yield None
+
+                yield "retry: 5000\n\n"
+                for event in backlog:
+                    yield _sse(event)
+
+                wait = min(heartbeat_seconds, poll_seconds) if poll_seconds else heartbeat_seconds
+                last_poll = last_write = time.monotonic()
+
+                while not sub.overflowed:
+                    event = sub.get(timeout=wait)
+                    if event is not None and event["id"] not in sent:
+                        sent.add(event["id"])
+                        last_write = time.monotonic()
+                        yield _sse(event)
+
+                    now = time.monotonic()
+                    if poll_seconds and now - last_poll >= poll_seconds:
+                        last_poll = now
+                        for event in poll(polled_to):
+                            polled_to = event["id"]
+                            if event["id"] not in sent:
+                                sent.add(event["id"])
+                                last_write = now
+                                yield _sse(event)
+                        if len(sent) > STREAM_SENT_IDS:
+                            sent = set(sorted(sent)[-STREAM_SENT_IDS // 2:])
+
+                    if now - last_write >= heartbeat_seconds:
+                        last_write = now
+                        yield ": heartbeat\n\n"
+            finally:
+                hub.unsubscribe(sub)
+
+        # run up to the first yield so subscribe/replay errors surface here;
+        # from then on closing or dropping the generator unsubscribes
+        lines = stream()
+        next(lines)
+        return lines
 
-    def list_for_user(self, user_id: int, only_unread: bool = False):
-        items = self.notification_repo.list_for_user(user_id, only_unread=only_unread)
-        return [n.to_dict() for n in items]
+    def unread_count(self, user_id: int) -> int:
+        return self.notification_repo.count_unread(user_id)
 
     def mark_read(self, user_id: int, notif_id: int) -> bool:
         return self.notification_repo.mark_read(notif_id, user_id=user_id)
@@ -6,15 +6,6 @@ from app.usecase.activitylog_uc import ActivityLogUC
 from app.models.user import User
 
 
-def _has_perm(user_id, code):
-    user = User.query.get(user_id)
-    if not user:
-        raise PermissionError("User not found")
-    if code not in user.permission_codes:
-        raise PermissionError(f"No permission: {code}")
-    return user
-
-
 class ProjectUC:
     def __init__(
         self,
@@ -28,8 +19,16 @@ class ProjectUC:
         self.permission_repo = permission_repo or PermissionRepo()
         self.activitylog_uc = activitylog_uc or ActivityLogUC()
 
+    def _has_perm(self, user_id, code):
+        user = User.query.get(user_id)
+        if not user:
+            raise PermissionError("User not found")
+        if not self.permission_repo.user_has(user_id, code):
+            raise PermissionError(f"No permission: {code}")
+        return user
+
     def get_all_projects(self, user_id):
-        user = _has_perm(user_id, "PROJECT_VIEW")
+        user = self._has_perm(user_id, "PROJECT_VIEW")
 
         if user.role.code in ["ADMIN", "MENTOR"]:
             projects = self.project_repo.get_all()
@@ -43,7 +42,7 @@ class ProjectUC:
 
 
     def get_project_by_id(self, user_id, project_id):
-        user = _has_perm(user_id, "PROJECT_VIEW")  # kiểm tra user tồn tại + perm
+        user = self._has_perm(user_id, "PROJECT_VIEW")  # kiểm tra user tồn tại + perm
 
         project = self.project_repo.get_by_id(project_id)
         if not project:
@@ -62,7 +61,7 @@ class ProjectUC:
 
     
     def create_project(self, user_id, data):
-        _has_perm(user_id, "PROJECT_CREATE")
+        self._has_perm(user_id, "PROJECT_CREATE")
 
         project = self.project_repo.create(data)
 
@@ -75,7 +74,7 @@ class ProjectUC:
         return project.to_dict()
 
     def update_project(self, user_id, project_id, data):
-        _has_perm(user_id, "PROJECT_UPDATE")
+        self._has_perm(user_id, "PROJECT_UPDATE")
 
         project = self.project_repo.get_by_id(project_id)
         if not project:
@@ -103,7 +102,7 @@ class ProjectUC:
         return None
 
     def delete_project(self, user_id, project_id, soft=True):
-        _has_perm(user_id, "PROJECT_DELETE")
+        self._has_perm(user_id, "PROJECT_DELETE")
 
         ok = self.project_repo.delete(project_id, soft=soft)
 
@@ -118,11 +117,11 @@ class ProjectUC:
         return ok
 
     def get_interns_of_project(self, user_id, project_id):
-        _has_perm(user_id, "PROJECT_VIEW")
+        self._has_perm(user_id, "PROJECT_VIEW")
         return self.intern_project_repo.get_interns_of_project(project_id)
 
     def assign_intern(self, user_id, intern_id, project_id, role):
-        _has_perm(user_id, "PROJECT_ASSIGN_INTERN")
+        self._has_perm(user_id, "PROJECT_ASSIGN_INTERN")
 
         link = self.intern_project_repo.create_link(intern_id, project_id, role)
 
@@ -135,7 +134,7 @@ class ProjectUC:
         return link.to_dict()
 
     def remove_intern(self, user_id, intern_id, project_id):
-        _has_perm(user_id, "PROJECT_ASSIGN_INTERN")
+        self._has_perm(user_id, "PROJECT_ASSIGN_INTERN")
 
         ok = self.intern_project_repo.remove_link(intern_id, project_id)
 
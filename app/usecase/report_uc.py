@@ -1,11 +1,60 @@
+import os
 from app.repo.report_repo import ReportRepo
+from app.repo.report_projection import REPORT_PROJECTIONS
 from app.repo.permission_repo import PermissionRepo
+from app.repo.rating_summary_repo import RatingSummaryRepo
+from app.repo.report_mart_repo import ReportMartRepo
+from app.models.rating_summary import InternRatingSummary, ProjectRatingSummary
+from app.models.feedback import FeedbackType
 
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-from openpyxl.utils import get_column_letter
+from app.utils.excel_export import StreamingExcelWriter
+from app.utils.parquet_export import StreamingParquetWriter, parquet_available
+from app.db.csv_ex import StreamingCsvWriter
+from app.utils.export_jobs import export_jobs
+from app.utils.report_cache import report_cache, filter_key
+from app.utils.report_mart import report_mart
 
-import io
+REPORT_TYPES = ("intern", "project", "feedback", "all")
+# report type -> (sheet name in the "all" export, title of its own export)
+REPORT_SHEETS = {
+    "intern": ("Sinh viên", "Báo Cáo Sinh Viên Thực Tập"),
+    "project": ("Dự án", "Báo Cáo Dự Án"),
+    "feedback": ("Đánh giá", "Báo Cáo Đánh Giá"),
+}
+# payload "format" -> writer; all share add_sheet / finish
+EXPORT_WRITERS = {
+    "excel": StreamingExcelWriter,
+    "csv": StreamingCsvWriter,
+    "parquet": StreamingParquetWriter,
+}
+
+
+# (bucket, lowest score) from the top down; the last bucket takes the rest
+INTERN_RATING_BUCKETS = (("excellent", 9), ("good", 7), ("average", 5), ("poor", None))
+PROJECT_RATING_BUCKETS = (
+    ("5_star", 4.5), ("4_star", 3.5), ("3_star", 2.5), ("2_star", 1.5), ("1_star", None)
+)
+
+
+def _bucket(score, buckets):
+    for name, low in buckets:
+        if low is None or score >= low:
+            return name
+
+
+def _intern_bucket(score):
+    return _bucket(score, INTERN_RATING_BUCKETS)
+
+
+def _project_bucket(score):
+    return _bucket(score, PROJECT_RATING_BUCKETS)
+
+
+def _empty_distributions():
+    return (
+        {name: 0 for name, _ in INTERN_RATING_BUCKETS},
+        {name: 0 for name, _ in PROJECT_RATING_BUCKETS},
+    )
 
 
 class ReportUC:
@@ -15,21 +64,49 @@ class ReportUC:
         permission_repo=None,
         intern_repo=None,
         project_repo=None,
-        feedback_repo=None
+        feedback_repo=None,
+        rating_summary_repo=None,
+        mart_repo=None,
+        use_mart=None
     ):
         self.report_repo = report_repo or ReportRepo()
         self.permission_repo = permission_repo or PermissionRepo()
         self.intern_repo = intern_repo
         self.project_repo = project_repo
         self.feedback_repo = feedback_repo
+        self.rating_summary_repo = rating_summary_repo or RatingSummaryRepo()
+        self.mart_repo = mart_repo or ReportMartRepo()
+        # statistics from the daily fact tables instead of the live tables
+        self.use_mart = report_mart.serve_statistics if use_mart is None else use_mart
 
     def _check(self, user_id):
         if not self.permission_repo.user_has(user_id, "VIEW_REPORT"):
             raise PermissionError("Missing permission: VIEW_REPORT")
 
-    def export_report(self, user_id, payload):
+    def _writer_class(self, payload):
+        fmt = (payload.get("format") or "excel").lower()
+        if fmt not in EXPORT_WRITERS:
+            raise ValueError("Invalid export format")
+        if fmt == "parquet" and not parquet_available():
+            raise ValueError("Parquet export requires pyarrow")
+        return EXPORT_WRITERS[fmt]
+
+    def export_file_info(self, payload):
+        """``(download_name, mimetype)`` of the file export_report builds."""
+        writer_class = self._writer_class(payload)
+        rtype = payload.get("type", "data")
+
+        if rtype == "all" and writer_class.multi_part:
+            return "report_all.zip", "application/zip"
+        return f"report_{rtype}.{writer_class.extension}", writer_class.mimetype
+
+    def export_report(self, user_id, payload, progress=None, path=None):
+        """Build the export in the payload's format; written to `path` when
+        given, else returned as a spooled file. `progress(rows_written)`
+        reports how far it got."""
         self._check(user_id)
 
+        writer_class = self._writer_class(payload)
         rtype = payload.get("type")
         fdate = payload.get("from_date")
         tdate = payload.get("to_date")
@@ -43,31 +120,71 @@ class ReportUC:
             "status": status
         }
 
-        if rtype == "intern":
-            data = self.report_repo.get_interns(filters)
-            return self._excel_single(data, "Báo Cáo Sinh Viên Thực Tập")
-
-        if rtype == "project":
-            data = self.report_repo.get_projects(filters)
-            return self._excel_single(data, "Báo Cáo Dự Án")
-
         if rtype == "feedback":
             filters["intern_id"] = payload.get("intern_id")
             filters["project_id"] = payload.get("project_id")
-            data = self.report_repo.get_feedback(filters)
-            return self._excel_single(data, "Báo Cáo Đánh Giá")
+
+        if rtype in REPORT_SHEETS:
+            projection = self._export_projection(rtype)
+            return self._export_single(
+                writer_class, projection, self.report_repo.stream(projection, filters),
+                REPORT_SHEETS[rtype][1], progress, path
+            )
 
         if rtype == "all":
-            interns = self.report_repo.get_interns(filters)
-            projects = self.report_repo.get_projects(filters)
-            feedbacks = self.report_repo.get_feedback(filters)
-            return self._excel_multi(interns, projects, feedbacks)
+            # each stream is consumed before the next query starts
+            sheets = []
+            for sheet_type, (sheet_name, _) in REPORT_SHEETS.items():
+                projection = self._export_projection(sheet_type)
+                sheets.append((sheet_name, projection, self.report_repo.stream(projection, filters)))
+            return self._export_multi(writer_class, sheets, progress, path)
 
         raise ValueError("Invalid report type")
 
+    def submit_export(self, user_id, payload):
+        """Queue an export on the job pool and return the job status."""
+        self._check(user_id)
+
+        rtype = payload.get("type")
+        if rtype not in REPORT_TYPES:
+            raise ValueError("Invalid report type")
+        filename, mimetype = self.export_file_info(payload)
+
+        def build(progress, path):
+            self.export_report(user_id, payload, progress=progress, path=path)
+
+        job = export_jobs.submit(user_id, payload, filename, mimetype, build)
+        return job.to_dict()
+
+    def get_export_job(self, user_id, job_id):
+        job = export_jobs.get(job_id)
+        if not job or job.user_id != user_id:
+            raise LookupError("Export job not found")
+        return job.to_dict()
+
+    def get_export_file(self, job_id, token):
+        """Return ``(path, filename, mimetype)`` of a finished job; the token is the
+        credential, so the link works from a plain browser download."""
+        job = export_jobs.get(job_id)
+        if not job or not job.check_token(token):
+            raise LookupError("Export job not found")
+        if job.status != "done":
+            raise ValueError("Export is not ready")
+        path = export_jobs.path_for(job.id)
+        if not os.path.exists(path):
+            raise LookupError("Export file not found")
+        return path, job.filename, job.mimetype
+
     def get_statistics(self, user_id, params):
         self._check(user_id)
 
+        key = filter_key(
+            "statistics:mart" if self.use_mart else "statistics", params.get("from_date"), params.get("to_date"),
+            params.get("major"), params.get("status")
+        )
+        return report_cache.get_or_build(key, lambda: self._build_statistics(params))
+
+    def _build_statistics(self, params):
         filters = {
             "date_from": params.get("from_date"),
             "date_to": params.get("to_date"),
@@ -75,65 +192,97 @@ class ReportUC:
             "status": params.get("status")
         }
 
-        interns = self.report_repo.get_interns(filters)
-        projects = self.report_repo.get_projects(filters)
-        feedbacks = self.report_repo.get_feedback(filters)
+        if self.use_mart:
+            source = self.mart_repo
+            feedback_count, avg, intern_ratings, project_ratings = self._feedback_stats_from_mart(filters)
+        elif filters["date_from"] or filters["date_to"]:
+            source = self.report_repo
+            feedback_count, avg, intern_ratings, project_ratings = self._feedback_stats(filters)
+        else:
+            source = self.report_repo
+            feedback_count, avg, intern_ratings, project_ratings = self._feedback_stats_from_summary()
 
-        avg = sum(f.score for f in feedbacks) / len(feedbacks) if feedbacks else 0
-        completed = len([p for p in projects if p.status == "done"])
-        total = len(projects)
+        # every figure below is aggregated in SQL; only the grouped rows come back
+        total, completed = source.count_projects(filters)
         in_progress = total - completed
 
         major_stats = {}
-        for i in interns:
-            major = i.major or "Chưa phân loại"
-            major_stats[major] = major_stats.get(major, 0) + 1
-
-        intern_ratings = {"excellent": 0, "good": 0, "average": 0, "poor": 0}
-        project_ratings = {"5_star": 0, "4_star": 0, "3_star": 0, "2_star": 0, "1_star": 0}
-        
-        for f in feedbacks:
-            try:
-                score = float(f.score) if hasattr(f, 'score') else 0
-                
-                if hasattr(f, 'to_intern_id') and f.to_intern_id:
-                    if score >= 9:
-                        intern_ratings["excellent"] += 1
-                    elif score >= 7:
-                        intern_ratings["good"] += 1
-                    elif score >= 5:
-                        intern_ratings["average"] += 1
-                    else:
-                        intern_ratings["poor"] += 1
-                        
-                elif hasattr(f, 'to_project_id') and f.to_project_id:
-                    if score >= 4.5:
-                        project_ratings["5_star"] += 1
-                    elif score >= 3.5:
-                        project_ratings["4_star"] += 1
-                    elif score >= 2.5:
-                        project_ratings["3_star"] += 1
-                    elif score >= 1.5:
-                        project_ratings["2_star"] += 1
-                    else:
-                        project_ratings["1_star"] += 1
-                        
-            except (ValueError, TypeError, AttributeError):
-                intern_ratings["poor"] += 1
+        for major, count in source.count_interns_by_major(filters):
+            major = major or "Chưa phân loại"
+            major_stats[major] = major_stats.get(major, 0) + count
 
         return {
-            "intern_count": len(interns),
+            "intern_count": sum(major_stats.values()),
             "project_total": total,
             "project_completed": completed,
             "project_in_progress": in_progress,
             "project_completion_rate": completed / total if total else 0,
             "average_rating": round(avg, 2) if avg else 0,
-            "feedback_count": len(feedbacks),
+            "feedback_count": feedback_count,
             "major_stats": major_stats,
             "intern_rating_distribution": intern_ratings,
             "project_rating_distribution": project_ratings
         }
 
+    def _feedback_stats(self, filters):
+        intern_ratings, project_ratings = _empty_distributions()
+        distributions = {"intern": intern_ratings, "project": project_ratings}
+
+        score_sum = 0
+        score_count = 0
+        rows = self.report_repo.count_feedback_by_bucket(
+            filters, INTERN_RATING_BUCKETS, PROJECT_RATING_BUCKETS
+        )
+        for target, bucket, count, bucket_sum in rows:
+            if target in distributions:
+                distributions[target][bucket] += count
+            score_sum += int(bucket_sum or 0)
+            score_count += count
+
+        avg = score_sum / score_count if score_count else 0
+        return score_count, avg, intern_ratings, project_ratings
+
+    def _feedback_stats_from_mart(self, filters):
+        intern_ratings, project_ratings = _empty_distributions()
+        distributions = {
+            "intern": (intern_ratings, _intern_bucket),
+            "project": (project_ratings, _project_bucket),
+        }
+
+        score_sum = 0
+        score_count = 0
+        for target, score, count in self.mart_repo.count_feedback_by_score(filters):
+            if target in distributions:
+                distribution, bucket_of = distributions[target]
+                distribution[bucket_of(score)] += count
+            score_sum += score * count
+            score_count += count
+
+        avg = score_sum / score_count if score_count else 0
+        return score_count, avg, intern_ratings, project_ratings
+
+    def _feedback_stats_from_summary(self):
+        intern_ratings, project_ratings = _empty_distributions()
+
+        # INTERN_PROJECT feedback targets both the intern and the project; like
+        # _feedback_stats it is only counted once, on the intern side
+        sources = (
+            (InternRatingSummary, None, intern_ratings, _intern_bucket),
+            (ProjectRatingSummary, [FeedbackType.INTERN_PROJECT.value], project_ratings, _project_bucket),
+        )
+
+        score_sum = 0
+        score_count = 0
+        for model, exclude_types, distribution, bucket_of in sources:
+            for histogram in self.rating_summary_repo.get_histograms(model, exclude_types):
+                for score, count in histogram.items():
+                    distribution[bucket_of(float(score))] += count
+                    score_sum += int(score) * count
+                    score_count += count
+
+        avg = score_sum / score_count if score_count else 0
+        return score_count, avg, intern_ratings, project_ratings
+
     def view_report(self, user_id, filters):
         self._check(user_id)
 
@@ -150,114 +299,35 @@ class ReportUC:
             "status": status
         }
 
-        if rtype == "intern":
-            return self.report_repo.get_interns(query_filters)
-        if rtype == "project":
-            return self.report_repo.get_projects(query_filters)
+        if rtype not in REPORT_PROJECTIONS:
+            raise ValueError("Invalid type")
+
         if rtype == "feedback":
             query_filters["intern_id"] = filters.get("intern_id")
             query_filters["project_id"] = filters.get("project_id")
-            return self.report_repo.get_feedback(query_filters)
 
-        raise ValueError("Invalid type")
+        return self.report_repo.list_dicts(REPORT_PROJECTIONS[rtype], query_filters)
 
-    def _excel_single(self, records, title):
-        wb = Workbook()
-        ws = wb.active
-        ws.title = title[:31]  # Excel sheet name limit
+    def _export_projection(self, rtype):
+        # exports leave out the soft-delete flag (always false after filtering)
+        return REPORT_PROJECTIONS[rtype].without("is_deleted")
 
-        # Header
-        ws.merge_cells("A1:E1")
-        ws["A1"] = title
-        ws["A1"].font = Font(size=16, bold=True, color="FFFFFF")
-        ws["A1"].fill = PatternFill(start_color="4472C4", fill_type="solid")
-        ws["A1"].alignment = Alignment(horizontal="center", vertical="center")
-        ws.row_dimensions[1].height = 30
+    def _export_single(self, writer_class, projection, rows, title, progress=None, path=None):
+        writer = writer_class(progress)
+        writer.add_sheet(title, title, projection.names, rows, kinds=projection.kinds)
+        return writer.finish(path)
 
-        if not records:
-            ws.append(["Không có dữ liệu"])
-        else:
-            data_dicts = [self._clean_dict(r.to_dict()) for r in records]
-            keys = list(data_dicts[0].keys())
-
-            # Column headers
-            ws.append(keys)
-            for c in ws[2]:
-                c.font = Font(bold=True, color="FFFFFF")
-                c.fill = PatternFill(start_color="5B9BD5", fill_type="solid")
-                c.alignment = Alignment(horizontal="center", vertical="center")
-
-            # Data rows
-            for rec in data_dicts:
-                ws.append([rec.get(k) for k in keys])
-
-        self._format_sheet(ws)
-        buffer = io.BytesIO()
-        wb.save(buffer)
-        buffer.seek(0)
-        return buffer.read()
-
-    def _excel_multi(self, interns, projects, feedbacks):
-        wb = Workbook()
-
-        sheets = {
-            "Sinh viên": interns,
-            "Dự án": projects,
-            "Đánh giá": feedbacks
-        }
+    def _export_multi(self, writer_class, sheets, progress=None, path=None):
+        writer = writer_class(progress)
+
+        for sheet_name, projection, rows in sheets:
+            writer.add_sheet(
+                sheet_name, f"Báo Cáo {sheet_name}", projection.names, rows,
+                kinds=projection.kinds, title_size=14, title_height=25
+            )
+
+        return writer.finish(path)
 
-        first = True
-        for sheet_name, items in sheets.items():
-            ws = wb.active if first else wb.create_sheet(sheet_name)
-            if not first:
-                ws.title = sheet_name
-            first = False
-
-            # Header
-            ws.merge_cells("A1:E1")
-            ws["A1"] = f"Báo Cáo {sheet_name}"
-            ws["A1"].font = Font(size=14, bold=True, color="FFFFFF")
-            ws["A1"].fill = PatternFill(start_color="4472C4", fill_type="solid")
-            ws["A1"].alignment = Alignment(horizontal="center", vertical="center")
-            ws.row_dimensions[1].height = 25
-
-            if not items:
-                ws.append(["Không có dữ liệu"])
-            else:
-                data_dicts = [self._clean_dict(i.to_dict()) for i in items]
-                keys = list(data_dicts[0].keys())
-
-                ws.append(keys)
-                for c in ws[2]:
-                    c.font = Font(bold=True, color="FFFFFF")
-                    c.fill = PatternFill(start_color="5B9BD5", fill_type="solid")
-                    c.alignment = Alignment(horizontal="center", vertical="center")
-
-                for row in data_dicts:
-                    ws.append([row.get(k) for k in keys])
-
-            self._format_sheet(ws)
-
-        buffer = io.BytesIO()
-        wb.save(buffer)
-        buffer.seek(0)
-        return buffer.read()
-
-    def _format_sheet(self, ws):
-        thin = Side(border_style="thin", color="CCCCCC")
-
-        for row in ws.iter_rows():
-            for cell in row:
-                cell.border = Border(left=thin, right=thin, top=thin, bottom=thin)
-                cell.alignment = Alignment(vertical="center", wrap_text=True)
-
-        for col in ws.columns:
-            length = max(len(str(c.value or "")) for c in col)
-            ws.column_dimensions[get_column_letter(col[0].column)].width = min(length + 3, 50)
-
-    def _clean_dict(self, d):
-        return {k: v for k, v in d.items() if k not in ["is_deleted", "password_hash"]}
-    
     def get_majors(self, user_id):
         self._check(user_id)
-        return self.report_repo.get_distinct_majors()
+        return report_cache.get_or_build(filter_key("majors"), self.report_repo.get_distinct_majors)
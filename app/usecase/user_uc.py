@@ -4,7 +4,6 @@ from app.repo.user_repo import UserRepo
 from app.repo.role_repo import RoleRepo
 from app.repo.permission_repo import PermissionRepo
 from app.usecase.activitylog_uc import ActivityLogUC
-from app.utils.mail_service import MailService
 from app.utils.notification_service import NotificationService
 from app.utils.exception import NotFound, BadRequest
 
@@ -36,14 +35,12 @@ class UserUC:
         role_repo: RoleRepo | None = None,
         permission_repo: PermissionRepo | None = None,
         activitylog_uc: ActivityLogUC | None = None,
-        mail_service: MailService | None = None,
         notification_service: NotificationService | None = None,
     ):
         self.user_repo = user_repo or UserRepo()
         self.role_repo = role_repo or RoleRepo()
         self.permission_repo = permission_repo or PermissionRepo()
         self.activitylog_uc = activitylog_uc or ActivityLogUC()
-        self.mail_service = mail_service or MailService()
         self.notification_service = notification_service or NotificationService()
 
     def _require(self, user_id: int, perm_code: str):
@@ -82,7 +79,7 @@ class UserUC:
                 f"Role ID: {user.role_id or '-'}\n\n"
                 f"Please login and change your password."
             )
-            self.mail_service.send_mail(user.email, subject, text_body)
+            self.notification_service.send_mail(user.email, subject, text_body, commit=False)
 
         self.notification_service.notify_user(
             user_id=user.id,
@@ -128,7 +125,7 @@ class UserUC:
                 "Your account password has been updated by administrator.\n"
                 "If this was not you, please contact support."
             )
-            self.mail_service.send_mail(updated.email, subject, text_body)
+            self.notification_service.send_mail(updated.email, subject, text_body)
 
         return updated.to_dict()
 
@@ -0,0 +1,124 @@
+import atexit
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+
+
+class ActivityLogWriter:
+    """Buffers activity log entries and writes them in bulk INSERTs.
+
+    In async mode a daemon worker flushes whenever ``batch_size`` entries are
+    queued or ``flush_seconds`` have passed since the last flush. Sync mode
+    writes each entry immediately, which keeps tests deterministic.
+    """
+
+    def __init__(self, batch_size=100, flush_seconds=2.0, async_mode=True):
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.async_mode = async_mode
+        self.written = 0
+        self.dropped = 0
+        self._app = None
+        self._queue = queue.Queue()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def configure(self, app, batch_size=None, flush_seconds=None, async_mode=None):
+        self._app = app
+        if batch_size is not None:
+            self.batch_size = batch_size
+        if flush_seconds is not None:
+            self.flush_seconds = flush_seconds
+        if async_mode is not None:
+            self.async_mode = async_mode
+
+    def enqueue(self, user_id, action, details):
+        entry = {
+            "user_id": user_id or None,
+            "action": action,
+            "details": details,
+            "timestamp": datetime.now(timezone.utc)
+        }
+
+        if not self.async_mode or self._app is None:
+            self._write([entry])
+            return entry
+
+        self._ensure_worker()
+        self._queue.put(entry)
+        return entry
+
+    def _ensure_worker(self):
+        if self._thread and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="activity-log-writer", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            deadline = time.monotonic() + self.flush_seconds
+            while self._queue.qsize() < self.batch_size and not self._stop.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._stop.wait(min(remaining, 0.1))
+            self.flush()
+
+    def _drain(self):
+        entries = []
+        while len(entries) < self.batch_size:
+            try:
+                entries.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return entries
+
+    def flush(self):
+        """Write everything queued so far; returns the number of rows written."""
+        total = 0
+        with self._flush_lock:
+            while True:
+                entries = self._drain()
+                if not entries:
+                    return total
+                if self._app is not None:
+                    with self._app.app_context():
+                        total += self._write(entries)
+                else:
+                    total += self._write(entries)
+
+    def _write(self, entries):
+        from app.repo.activitylog_repo import ActivityLogRepo
+
+        try:
+            count = ActivityLogRepo().bulk_insert(entries)
+            self.written += count
+            return count
+        except Exception as e:
+            self.dropped += len(entries)
+            print("ACTIVITY LOG FLUSH ERROR:", e)
+            return 0
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def stop(self):
+        """Stop the worker and flush whatever is still queued."""
+        self._stop.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join()
+        self._thread = None
+        self.flush()
+
+
+activity_log_writer = ActivityLogWriter()
+atexit.register(activity_log_writer.stop)
@@ -1,53 +1,91 @@
 from functools import wraps
-from flask import request, jsonify, g
-from sqlalchemy.orm import joinedload
-from app.models.role import Role
+from flask import request, jsonify, g, current_app
 from app.utils.token_service import decode_access_token
-from app.models.user import User
 from app.utils.exception import Unauthorized, PermissionDenied
-from app.repo.permission_repo import PermissionRepo
+from app.repo.user_repo import UserRepo
+from app.utils.permission_scope import set_token_scope, clear_token_scope
 
-permission_repo = PermissionRepo()
+user_repo = UserRepo()
 
 
-def load_user():
-    if hasattr(g, "current_user") and g.current_user:
-        return g.current_user
-
-    token = None
-
+def get_request_token():
     auth_header = request.headers.get("Authorization", "")
     if auth_header.startswith("Bearer "):
         token = auth_header.split(" ", 1)[1].strip()
+        if token:
+            return token
+
+    return request.cookies.get("access_token")
+
+
+def get_auth_query_count():
+    return getattr(g, "auth_query_count", 0)
+
+
+def clear_principal():
+    g.principal_resolved = False
+    g.principal_error = None
+    g.auth_query_count = 0
+    clear_token_scope()
+
 
-    if not token:
-        token = request.cookies.get("access_token")
+def resolve_principal():
+    """Decode the token and load user + role + permissions once per request.
 
-    if not token:
-        raise Unauthorized("Missing access token")
+    The outcome (user or error) is memoized on ``g`` so before_request,
+    require_auth and the web views all share a single auth query.
+    """
+    if getattr(g, "principal_resolved", False):
+        if g.principal_error:
+            raise g.principal_error
+        return g.current_user
+
+    g.principal_resolved = True
+    g.principal_error = None
+    g.current_user = None
+    g.current_permissions = []
+
+    try:
+        token = get_request_token()
+        if not token:
+            raise Unauthorized("Missing access token")
+
+        payload = decode_access_token(token)
+        user_id = int(payload.get("sub"))
+        trust_token = current_app.config.get("TRUST_TOKEN_PERMISSIONS", False)
+
+        g.auth_query_count = get_auth_query_count() + 1
+        user = user_repo.get_principal(user_id, with_permissions=not trust_token)
 
-    payload = decode_access_token(token)
-    user_id = int(payload.get("sub"))
+        if not user:
+            raise Unauthorized("User inactive or deleted")
 
-    user = (
-        User.query.options(joinedload(User.role).joinedload(Role.permissions))
-        .filter(
-            User.id == user_id,
-            User.is_deleted == False,
-            User.is_active == True
-        )
-        .first()
-    )
+        if trust_token and (
+            payload.get("rid") != user.role_id
+            or payload.get("pv") != user.permissions_version
+        ):
+            # role changed since the token was issued -> client must refresh
+            raise Unauthorized("SESSION_EXPIRED")
 
-    if not user:
-        raise Unauthorized("User inactive or deleted")
+    except Exception as e:
+        g.principal_error = e
+        raise
 
     g.current_user = user
-    g.current_permissions = [p.code for p in user.role.permissions] if user.role else []
+
+    if trust_token:
+        g.current_permissions = payload.get("permissions") or []
+        set_token_scope(user.id, g.current_permissions)
+    else:
+        g.current_permissions = user.permission_codes
 
     return user
 
 
+def load_user():
+    return resolve_principal()
+
+
 def require_auth(f):
     @wraps(f)
     def wrapper(*args, **kwargs):
@@ -68,13 +106,10 @@ def require_permission(code):
         @wraps(f)
         def wrapper(*args, **kwargs):
             try:
-                user = load_user()
-
-                if code in g.current_permissions:
-                    return f(*args, **kwargs)
+                load_user()
 
-                has_perm = permission_repo.user_has_permission(user.role_id, code)
-                if not has_perm:
+                # permissions were loaded together with the principal
+                if code not in g.current_permissions:
                     raise PermissionDenied(f"Missing permission: {code}")
 
             except Unauthorized as e:
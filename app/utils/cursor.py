@@ -0,0 +1,26 @@
+import base64
+from datetime import datetime
+from app.utils.exception import BadRequest
+
+
+def encode_cursor(ts, row_id):
+    """Opaque keyset cursor for a (timestamp, id) position."""
+    raw = f"{ts.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        ts, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(ts), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise BadRequest("Invalid cursor")
+
+
+def parse_limit(value, default, maximum):
+    try:
+        limit = int(value or default)
+    except ValueError:
+        raise BadRequest("Invalid limit")
+    return max(1, min(limit, maximum))
@@ -0,0 +1,93 @@
+import threading
+import time
+from datetime import datetime, timezone
+
+
+class DashboardSnapshotCache:
+    """Process-wide dashboard snapshot, rebuilt at most once per refresh interval.
+
+    Concurrent misses are single-flighted: one request rebuilds while the
+    others wait for it and then reuse its result, even if writes already
+    marked it dirty again; only a request arriving after that triggers the
+    next rebuild.
+    """
+
+    def __init__(self, refresh_seconds=60, invalidate_on_write=True):
+        self.refresh_seconds = refresh_seconds
+        self.invalidate_on_write = invalidate_on_write
+        self.builds = 0
+        self._data = None
+        self._built_at = None
+        self._built_monotonic = 0.0
+        self._dirty = False
+        # bumped by every write; tells whether one landed during a build
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    def configure(self, refresh_seconds=None, invalidate_on_write=None):
+        if refresh_seconds is not None:
+            self.refresh_seconds = refresh_seconds
+        if invalidate_on_write is not None:
+            self.invalidate_on_write = invalidate_on_write
+
+    def _fresh(self):
+        with self._lock:
+            if self._data is None or self._dirty:
+                return None
+            if time.monotonic() - self._built_monotonic > self.refresh_seconds:
+                return None
+            return self._data, self._built_at
+
+    def get(self, builder):
+        """Return ``(data, built_at)``, calling ``builder()`` only when stale."""
+        snapshot = self._fresh()
+        if snapshot:
+            return snapshot
+
+        with self._lock:
+            builds_seen = self.builds
+
+        with self._build_lock:
+            with self._lock:
+                # rebuilt while this request waited: take that result
+                if self.builds != builds_seen and self._data is not None:
+                    return self._data, self._built_at
+
+            snapshot = self._fresh()
+            if snapshot:
+                return snapshot
+
+            with self._lock:
+                generation = self._generation
+
+            # if this raises, the old snapshot stays dirty / stale
+            data = builder()
+
+            with self._lock:
+                self._data = data
+                self._built_at = datetime.now(timezone.utc)
+                self._built_monotonic = time.monotonic()
+                # a write that landed during the build keeps the snapshot dirty
+                self._dirty = self._generation != generation
+                self.builds += 1
+                return self._data, self._built_at
+
+    def mark_dirty(self):
+        if not self.invalidate_on_write:
+            return
+        with self._lock:
+            self._generation += 1
+            self._dirty = True
+
+    def clear(self):
+        with self._lock:
+            self._data = None
+            self._built_at = None
+
+
+dashboard_cache = DashboardSnapshotCache()
+
+
+def mark_dashboard_dirty():
+    dashboard_cache.mark_dirty()
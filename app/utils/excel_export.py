@@ -0,0 +1,134 @@
+import itertools
+from tempfile import SpooledTemporaryFile
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import NamedStyle, Font, Alignment, PatternFill, Border, Side
+from openpyxl.utils import get_column_letter
+
+# files larger than this spill from memory to disk
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+# column widths are estimated from the header and the first rows only
+WIDTH_SAMPLE_ROWS = 200
+MAX_COLUMN_WIDTH = 50
+EMPTY_MESSAGE = "Không có dữ liệu"
+# how often (in rows) the progress callback is called
+PROGRESS_EVERY_ROWS = 500
+# number format per declared column kind; other kinds keep the plain cell style
+KIND_NUMBER_FORMATS = {"int": "0", "float": "0.0"}
+
+
+def _thin_border():
+    thin = Side(border_style="thin", color="CCCCCC")
+    return Border(left=thin, right=thin, top=thin, bottom=thin)
+
+
+class StreamingExcelWriter:
+    """Write-only workbook: rows go straight to the output, so memory stays
+    at one width sample per sheet regardless of the row count.
+
+    Styles are registered once as named styles and referenced by name
+    from every cell instead of building Font/Border objects per cell.
+    """
+
+    extension = "xlsx"
+    mimetype = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    # every sheet goes into the one workbook
+    multi_part = False
+
+    def __init__(self, progress=None):
+        """`progress(rows_written)` is called every PROGRESS_EVERY_ROWS rows."""
+        self.wb = Workbook(write_only=True)
+        self.progress = progress
+        self.rows_written = 0
+        border = _thin_border()
+
+        for size in (14, 16):
+            self.wb.add_named_style(NamedStyle(
+                name=f"report_title_{size}",
+                font=Font(size=size, bold=True, color="FFFFFF"),
+                fill=PatternFill(start_color="4472C4", fill_type="solid"),
+                alignment=Alignment(horizontal="center", vertical="center"),
+                border=border,
+            ))
+        self.wb.add_named_style(NamedStyle(
+            name="report_header",
+            font=Font(bold=True, color="FFFFFF"),
+            fill=PatternFill(start_color="5B9BD5", fill_type="solid"),
+            alignment=Alignment(horizontal="center", vertical="center", wrap_text=True),
+            border=border,
+        ))
+        self.wb.add_named_style(NamedStyle(
+            name="report_cell",
+            alignment=Alignment(vertical="center", wrap_text=True),
+            border=border,
+        ))
+        for kind, number_format in KIND_NUMBER_FORMATS.items():
+            self.wb.add_named_style(NamedStyle(
+                name=f"report_cell_{kind}",
+                number_format=number_format,
+                alignment=Alignment(horizontal="right", vertical="center"),
+                border=border,
+            ))
+
+    def _cell(self, ws, value, style):
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = style
+        return cell
+
+    def add_sheet(self, name, title, columns, rows, kinds=None, title_size=16, title_height=30):
+        """`columns` is the header row; `rows` any iterable of value sequences.
+        `kinds` (one per column) gives int / float columns a number format."""
+        ws = self.wb.create_sheet(name[:31])  # Excel sheet name limit
+
+        rows = iter(rows)
+        sample = list(itertools.islice(rows, WIDTH_SAMPLE_ROWS))
+
+        if not columns or not sample:
+            columns, sample = None, [[EMPTY_MESSAGE]]
+
+        widths = {}
+        for row in itertools.chain([columns or []], sample):
+            for idx, value in enumerate(row, start=1):
+                widths[idx] = max(widths.get(idx, 0), len(str(value or "")))
+        widths[1] = max(widths.get(1, 0), len(title))
+
+        # dimensions must be set before the first row is written
+        for idx, width in widths.items():
+            ws.column_dimensions[get_column_letter(idx)].width = min(width + 3, MAX_COLUMN_WIDTH)
+        ws.row_dimensions[1].height = title_height
+
+        ws.append([self._cell(ws, title, f"report_title_{title_size}")])
+        ws.merged_cells.add("A1:E1")
+
+        if columns:
+            ws.append([self._cell(ws, c, "report_header") for c in columns])
+
+        styles = [
+            f"report_cell_{kind}" if kind in KIND_NUMBER_FORMATS else "report_cell"
+            for kind in (kinds if columns and kinds else [])
+        ]
+
+        for row in itertools.chain(sample, rows if columns else ()):
+            ws.append([
+                self._cell(ws, v, styles[i] if i < len(styles) else "report_cell")
+                for i, v in enumerate(row)
+            ])
+            self.rows_written += 1
+            if self.progress and self.rows_written % PROGRESS_EVERY_ROWS == 0:
+                self.progress(self.rows_written)
+
+        if self.progress:
+            self.progress(self.rows_written)
+
+    def finish(self, path=None):
+        """Save to `path` when given, otherwise into a spooled temp file
+        returned rewound for streaming."""
+        if path:
+            self.wb.save(path)
+            return path
+
+        out = SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+        self.wb.save(out)
+        out.seek(0)
+        return out
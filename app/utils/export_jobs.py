@@ -0,0 +1,135 @@
+import atexit
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ExportJobManager:
+    """Builds report files on a small worker pool, off the request threads.
+
+    Job state lives in the report_export_jobs table and files in
+    ``directory``, so any worker process can answer a status poll or serve
+    the download as long as the directory is shared. Finished jobs are kept
+    for ``ttl_seconds`` and then removed, row and file, by a periodic sweep.
+    """
+
+    def __init__(self, workers=2, directory=None, ttl_seconds=3600):
+        self.workers = workers
+        self.directory = directory or os.path.join(tempfile.gettempdir(), "mini_erp_exports")
+        self.ttl_seconds = ttl_seconds
+        self._app = None
+        self._executor = None
+        self._active = set()
+        self._lock = threading.Lock()
+        self._sweeper = None
+
+    def configure(self, app, workers=None, directory=None, ttl_seconds=None):
+        self._app = app
+        if workers is not None:
+            self.workers = workers
+        if directory:
+            self.directory = directory
+        if ttl_seconds is not None:
+            self.ttl_seconds = ttl_seconds
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._executor is None:
+                os.makedirs(self.directory, exist_ok=True)
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="report-export"
+                )
+            if self._sweeper is None or not self._sweeper.is_alive():
+                self._sweeper = threading.Thread(target=self._sweep_loop, name="export-sweeper", daemon=True)
+                self._sweeper.start()
+
+    def path_for(self, job_id):
+        return os.path.join(self.directory, job_id)
+
+    def submit(self, user_id, payload, filename, mimetype, build):
+        """`build(progress, path)` writes the file at `path` inside an app
+        context, calling `progress(rows_written)` as it goes."""
+        from app.repo.export_job_repo import ExportJobRepo
+
+        self._ensure_started()
+        job = ExportJobRepo().create(user_id, payload, filename, mimetype, self.ttl_seconds)
+        with self._lock:
+            self._active.add(job.id)
+        self._executor.submit(self._run, job.id, build)
+        return job
+
+    def _run(self, job_id, build):
+        from app.repo.export_job_repo import ExportJobRepo
+
+        repo = ExportJobRepo()
+        path = self.path_for(job_id) + ".part"
+        try:
+            with self._app.app_context():
+                repo.update(job_id, status="running")
+                try:
+                    build(lambda rows: repo.update(job_id, rows=rows), path)
+                    os.replace(path, self.path_for(job_id))
+                    if not repo.finish(job_id, "done", self.ttl_seconds):
+                        # swept while running
+                        os.remove(self.path_for(job_id))
+                except Exception as e:
+                    print("EXPORT JOB ERROR:", e)
+                    if os.path.exists(path):
+                        os.remove(path)
+                    repo.finish(job_id, "failed", self.ttl_seconds, error=str(e))
+        except Exception as e:
+            print("EXPORT JOB ERROR:", e)
+        finally:
+            with self._lock:
+                self._active.discard(job_id)
+
+    def get(self, job_id):
+        from app.repo.export_job_repo import ExportJobRepo
+        return ExportJobRepo().get(job_id)
+
+    def _remove_files(self, job_id):
+        for path in (self.path_for(job_id), self.path_for(job_id) + ".part"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def cleanup(self):
+        from app.repo.export_job_repo import ExportJobRepo
+
+        expired = ExportJobRepo().delete_expired()
+        for job_id in expired:
+            self._remove_files(job_id)
+        return len(expired)
+
+    def _sweep_loop(self):
+        while True:
+            time.sleep(max(self.ttl_seconds / 4, 1))
+            try:
+                with self._app.app_context():
+                    self.cleanup()
+            except Exception as e:
+                print("EXPORT CLEANUP ERROR:", e)
+
+    def shutdown(self):
+        """Stop this process's pool; its unfinished jobs are marked failed.
+        Finished files stay for the other workers until they expire."""
+        from app.repo.export_job_repo import ExportJobRepo
+
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            active, self._active = list(self._active), set()
+        if not active or self._app is None:
+            return
+        try:
+            with self._app.app_context():
+                ExportJobRepo().fail_unfinished(active, "Interrupted by server shutdown")
+        except Exception as e:
+            print("EXPORT JOB ERROR:", e)
+
+
+export_jobs = ExportJobManager()
+atexit.register(export_jobs.shutdown)
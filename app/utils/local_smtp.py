@@ -0,0 +1,83 @@
+import socketserver
+import threading
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+
+    def reply(self, line):
+        self.wfile.write((line + "\r\n").encode())
+
+    def handle(self):
+        server = self.server.owner
+        envelope = {"from": None, "to": []}
+        self.reply("220 localhost ESMTP stand-in")
+
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors="replace").strip()
+            verb = command[:4].upper()
+
+            if verb in ("HELO", "EHLO"):
+                self.reply("250 localhost")
+            elif verb == "NOOP":
+                self.reply("250 OK")
+            elif verb == "RSET":
+                envelope = {"from": None, "to": []}
+                self.reply("250 OK")
+            elif verb == "MAIL":
+                envelope["from"] = command.split(":", 1)[1].strip(" <>")
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                envelope["to"].append(command.split(":", 1)[1].strip(" <>"))
+                self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                while True:
+                    chunk = self.rfile.readline()
+                    if not chunk or chunk in (b".\r\n", b".\n"):
+                        break
+                    data.append(chunk.decode(errors="replace"))
+                if server.fail_next > 0:
+                    server.fail_next -= 1
+                    self.reply("451 Temporary failure")
+                else:
+                    server.messages.append({**envelope, "data": "".join(data)})
+                    self.reply("250 OK")
+                envelope = {"from": None, "to": []}
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class LocalSMTPServer:
+    """Minimal in-process SMTP server that records messages, for tests.
+
+    Set ``fail_next`` to make that many DATA commands fail with a 451.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.messages = []
+        self.fail_next = 0
+        self._server = _TCPServer((host, port), _SMTPHandler)
+        self._server.owner = self
+        self.host, self.port = self._server.server_address
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
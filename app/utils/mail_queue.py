@@ -0,0 +1,246 @@
+import atexit
+import queue
+import smtplib
+import threading
+import time
+
+
+class SMTPConnectionPool:
+    """Keeps authenticated SMTP connections open between messages."""
+
+    def __init__(self, host, port, username=None, password=None, use_tls=True, max_idle=2, timeout=10):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self.opened = 0
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
+            server.starttls()
+        if self.username:
+            server.login(self.username, self.password)
+        self.opened += 1
+        return server
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                server = self._idle.pop() if self._idle else None
+            if server is None:
+                return self._connect()
+            try:
+                if server.noop()[0] == 250:
+                    return server
+            except smtplib.SMTPException:
+                pass
+            except OSError:
+                pass
+            self.discard(server)
+
+    def release(self, server):
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(server)
+                return
+        self.discard(server)
+
+    def discard(self, server):
+        try:
+            server.quit()
+        except Exception:
+            pass
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for server in idle:
+            self.discard(server)
+
+
+class MailJob:
+    def __init__(self, sender, to_email, message, on_done=None):
+        self.sender = sender
+        self.to_email = to_email
+        self.message = message
+        self.on_done = on_done
+        self.attempts = 0
+        self.enqueued_at = time.monotonic()
+
+
+class MailQueue:
+    """Delivers mail from worker threads over pooled SMTP connections.
+
+    Failed sends are retried with exponential backoff
+    (``backoff_seconds * 2 ** (attempt - 1)``) up to ``max_retries`` times.
+    With ``async_mode`` off every message is sent inline, once.
+    ``on_done(ok, error)`` is called once per job with its final outcome.
+    """
+
+    def __init__(self, workers=2, max_retries=3, backoff_seconds=2.0, async_mode=True):
+        self.workers = workers
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.async_mode = async_mode
+        self.pool = None
+        self._queue = queue.Queue()
+        self._threads = []
+        self._timers = set()
+        self._lock = threading.Lock()
+        self._sent = 0
+        self._failed = 0
+        self._retried = 0
+        self._in_flight = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+        self._last_error = None
+
+    def configure(self, workers=None, max_retries=None, backoff_seconds=None, async_mode=None):
+        if workers is not None:
+            self.workers = workers
+        if max_retries is not None:
+            self.max_retries = max_retries
+        if backoff_seconds is not None:
+            self.backoff_seconds = backoff_seconds
+        if async_mode is not None:
+            self.async_mode = async_mode
+
+    def configure_smtp(self, host, port, username=None, password=None, use_tls=True):
+        if self.pool:
+            self.pool.close_all()
+        self.pool = SMTPConnectionPool(
+            host, port, username, password,
+            use_tls=use_tls, max_idle=max(self.workers, 1)
+        )
+
+    def submit(self, sender, to_email, message, on_done=None):
+        job = MailJob(sender, to_email, message, on_done)
+        if not self.async_mode:
+            return self._deliver(job, retry=False)
+
+        self._ensure_workers()
+        self._queue.put(job)
+        return True
+
+    def _ensure_workers(self):
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            while len(self._threads) < self.workers:
+                t = threading.Thread(
+                    target=self._run, name=f"mail-worker-{len(self._threads)}", daemon=True
+                )
+                t.start()
+                self._threads.append(t)
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                self._deliver(job)
+            finally:
+                self._queue.task_done()
+
+    def _deliver(self, job, retry=True):
+        job.attempts += 1
+        with self._lock:
+            self._in_flight += 1
+
+        server = None
+        try:
+            server = self.pool.acquire()
+            server.sendmail(job.sender, job.to_email, job.message)
+            self.pool.release(server)
+        except Exception as e:
+            if server is not None:
+                self.pool.discard(server)
+            with self._lock:
+                self._in_flight -= 1
+                self._last_error = str(e)
+            print("MAIL ERROR:", e)
+            if retry and job.attempts <= self.max_retries:
+                self._schedule_retry(job)
+            else:
+                with self._lock:
+                    self._failed += 1
+                self._finish(job, False, str(e))
+            return False
+
+        latency = time.monotonic() - job.enqueued_at
+        with self._lock:
+            self._in_flight -= 1
+            self._sent += 1
+            self._latency_total += latency
+            self._latency_max = max(self._latency_max, latency)
+        self._finish(job, True, None)
+        return True
+
+    def _finish(self, job, ok, error):
+        if job.on_done is None:
+            return
+        try:
+            job.on_done(ok, error)
+        except Exception as e:
+            print("MAIL CALLBACK ERROR:", e)
+
+    def _schedule_retry(self, job):
+        delay = self.backoff_seconds * 2 ** (job.attempts - 1)
+
+        def requeue():
+            with self._lock:
+                self._timers.discard(timer)
+            self._queue.put(job)
+
+        timer = threading.Timer(delay, requeue)
+        timer.daemon = True
+        with self._lock:
+            self._retried += 1
+            self._timers.add(timer)
+        timer.start()
+
+    def metrics(self):
+        with self._lock:
+            return {
+                "depth": self._queue.qsize(),
+                "waiting_retry": len(self._timers),
+                "in_flight": self._in_flight,
+                "sent": self._sent,
+                "failed": self._failed,
+                "retried": self._retried,
+                "avg_latency_ms": round(self._latency_total / self._sent * 1000, 1) if self._sent else 0.0,
+                "max_latency_ms": round(self._latency_max * 1000, 1),
+                "smtp_connections_opened": self.pool.opened if self.pool else 0,
+                "workers": len([t for t in self._threads if t.is_alive()]),
+                "last_error": self._last_error,
+            }
+
+    def join(self):
+        """Block until every queued message has been handled."""
+        self._queue.join()
+
+    def stop(self):
+        """Drain the queue, stop the workers and close pooled connections."""
+        with self._lock:
+            threads = [t for t in self._threads if t.is_alive()]
+            timers, self._timers = self._timers, set()
+        for timer in timers:
+            timer.cancel()
+        for _ in threads:
+            self._queue.put(None)
+        for t in threads:
+            t.join()
+        with self._lock:
+            self._threads = []
+        if self.pool:
+            self.pool.close_all()
+
+
+mail_queue = MailQueue()
+atexit.register(mail_queue.stop)
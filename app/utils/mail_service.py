@@ -1,6 +1,6 @@
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from app.utils.mail_queue import mail_queue
 
 SMTP_SERVER = "smtp.gmail.com"
 SMTP_PORT = 587
@@ -8,25 +8,32 @@ SMTP_PORT = 587
 SMTP_USER = "tainhce181569@fpt.edu.vn"
 SMTP_PASS = "ynjr tdqx gieo nizl"
 
+if mail_queue.pool is None:
+    mail_queue.configure_smtp(SMTP_SERVER, SMTP_PORT, SMTP_USER, SMTP_PASS)
+
 
 class MailService:
-    def send_mail(self, to_email, subject, text_body):
-        try:
-            msg = MIMEMultipart()
-            msg["Subject"] = subject
-            msg["From"] = SMTP_USER
-            msg["To"] = to_email
+    def __init__(self, queue=None):
+        self.queue = queue or mail_queue
 
-            msg.attach(MIMEText(text_body, "plain"))
+    def build_message(self, to_email, subject, text_body):
+        msg = MIMEMultipart()
+        msg["Subject"] = subject
+        msg["From"] = SMTP_USER
+        msg["To"] = to_email
 
-            with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-                server.starttls()
-                server.login(SMTP_USER, SMTP_PASS)
-                server.sendmail(SMTP_USER, to_email, msg.as_string())
+        msg.attach(MIMEText(text_body, "plain"))
+        return msg.as_string()
 
-            print("Email sent successfully!")
-            return True
+    def send_mail(self, to_email, subject, text_body, on_done=None):
+        """Queue the message for background delivery; returns once queued.
+        ``on_done(ok, error)`` receives the final outcome."""
+        try:
+            message = self.build_message(to_email, subject, text_body)
+            return self.queue.submit(SMTP_USER, to_email, message, on_done)
 
         except Exception as e:
             print("MAIL ERROR:", e)
+            if on_done:
+                on_done(False, str(e))
             return False
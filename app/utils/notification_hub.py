@@ -0,0 +1,106 @@
+import queue
+import threading
+
+
+class InProcessFanout:
+    """Default fan-out: deliver straight to this process's subscribers.
+
+    A multi-process deployment can swap in a fan-out that publishes to a
+    shared broker (Redis pub/sub, Postgres LISTEN/NOTIFY, ...) and calls
+    ``hub.deliver_local`` from its listener in every worker.
+    """
+
+    def publish(self, hub, user_ids, event):
+        hub.deliver_local(user_ids, event)
+
+
+class Subscription:
+    def __init__(self, user_id, max_pending=100):
+        self.user_id = user_id
+        self.events = queue.Queue(maxsize=max_pending)
+        # set when events were dropped; the stream then closes so the client
+        # reconnects and replays from Last-Event-ID
+        self.overflowed = False
+
+    def get(self, timeout):
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class TooManyConnections(Exception):
+    pass
+
+
+class NotificationHub:
+    """Per-process pub/sub of new notifications for SSE connections.
+
+    With the default fan-out only this worker's streams hear an event; the
+    streams poll the notifications table to pick up the other workers'
+    (see NOTIFICATION_STREAM_POLL_SECONDS).
+    """
+
+    def __init__(self, max_connections=200, fanout=None):
+        self.max_connections = max_connections
+        self.fanout = fanout or InProcessFanout()
+        self.published = 0
+        self.dropped = 0
+        self._subscribers = {}
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def configure(self, max_connections=None, fanout=None):
+        if max_connections is not None:
+            self.max_connections = max_connections
+        if fanout is not None:
+            self.fanout = fanout
+
+    def subscribe(self, user_id):
+        with self._lock:
+            if self._count >= self.max_connections:
+                raise TooManyConnections()
+            sub = Subscription(user_id)
+            self._subscribers.setdefault(user_id, set()).add(sub)
+            self._count += 1
+            return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            subs = self._subscribers.get(sub.user_id)
+            if not subs or sub not in subs:
+                return
+            subs.discard(sub)
+            if not subs:
+                del self._subscribers[sub.user_id]
+            self._count -= 1
+
+    def publish(self, user_ids, event):
+        self.published += 1
+        self.fanout.publish(self, user_ids, event)
+
+    def deliver_local(self, user_ids, event):
+        with self._lock:
+            targets = [
+                sub for uid in user_ids
+                for sub in self._subscribers.get(uid, ())
+            ]
+        for sub in targets:
+            try:
+                sub.events.put_nowait(event)
+            except queue.Full:
+                sub.overflowed = True
+                self.dropped += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "connections": self._count,
+                "users": len(self._subscribers),
+                "max_connections": self.max_connections,
+                "published": self.published,
+                "dropped": self.dropped,
+            }
+
+
+notification_hub = NotificationHub()
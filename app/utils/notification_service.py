@@ -1,14 +1,26 @@
 from typing import Any
 from app.repo.notification_repo import NotificationRepo
-from app.utils.mail_service import MailService
+from app.repo.outbox_repo import OutboxRepo
+from app.repo.user_repo import UserRepo
+from app.repo.intern_project_repo import InternProjectRepo
 from app.models.user import User
 from app.db.db import db
+from datetime import datetime
 
 
 class NotificationService:
-    def __init__(self, notification_repo=None, mail_service=None):
+    """Records notification and mail intents in the outbox.
+
+    Intents are added to the current session. With ``commit=False`` they ride
+    along with the caller's next commit (the business write), otherwise they
+    are committed here. The outbox dispatcher creates the rows and sends mail.
+    """
+
+    def __init__(self, notification_repo=None, outbox_repo=None, user_repo=None, intern_project_repo=None):
         self.notification_repo = notification_repo or NotificationRepo()
-        self.mail_service = mail_service or MailService()
+        self.outbox_repo = outbox_repo or OutboxRepo()
+        self.user_repo = user_repo or UserRepo()
+        self.intern_project_repo = intern_project_repo or InternProjectRepo()
 
     def notify_user(
         self,
@@ -19,53 +31,96 @@ class NotificationService:
         link_url: str | None = None,
         meta: dict | None = None,
         send_email: bool = False,
+        commit: bool = True,
     ):
-        data = {
+        intent = self.outbox_repo.add_notification({
             "user_id": user_id,
             "title": title,
             "message": message,
             "type": type,
             "link_url": link_url,
             "meta": meta,
-            "is_read": False,
-        }
-
-        notif = self.notification_repo.create(data)
+            "created_at": datetime.utcnow().isoformat(),
+        })
 
         if send_email:
-            from app.models.user import User
-            user = db.session.get(User, user_id)
-            if user and user.email:
-                self.mail_service.send_mail(user.email, title, message)
+            self.outbox_repo.add_mail(title, message, user_id=user_id)
 
-        return notif
+        if commit:
+            db.session.commit()
 
+        return intent
 
-    def notify_user_obj(
+
+    def notify_many(
         self,
-        user: User,
+        user_ids,
         title: str,
         message: str,
         type: str | None = None,
         link_url: str | None = None,
-        meta: dict[str, Any] | None = None,
+        meta: dict | None = None,
         send_email: bool = False,
+        commit: bool = True,
     ):
-        notif = self.notification_repo.create({
-            "user_id": user.id,
+        """Same notification for many users: a single outbox row per intent,
+        fanned out by the dispatcher with one INSERT and one email lookup."""
+        user_ids = sorted({uid for uid in user_ids if uid})
+        if not user_ids:
+            return None
+
+        intent = self.outbox_repo.add_notification({
+            "user_ids": user_ids,
             "title": title,
             "message": message,
             "type": type,
             "link_url": link_url,
             "meta": meta,
-            "is_read": False,
+            "created_at": datetime.utcnow().isoformat(),
         })
 
+        if send_email:
+            self.outbox_repo.add_mail(title, message, user_ids=user_ids)
+
+        if commit:
+            db.session.commit()
+
+        return intent
+
+    def notify_role(self, role_code: str, title: str, message: str, **kwargs):
+        return self.notify_many(self.user_repo.get_ids_by_role(role_code), title, message, **kwargs)
+
+    def notify_project_interns(self, project_id: int, title: str, message: str, **kwargs):
+        return self.notify_many(
+            self.intern_project_repo.get_user_ids_by_project(project_id), title, message, **kwargs
+        )
+
+    def notify_user_obj(
+        self,
+        user: User,
+        title: str,
+        message: str,
+        type: str | None = None,
+        link_url: str | None = None,
+        meta: dict[str, Any] | None = None,
+        send_email: bool = False,
+        commit: bool = True,
+    ):
+        intent = self.notify_user(
+            user.id, title, message,
+            type=type, link_url=link_url, meta=meta, commit=False
+        )
+
         if send_email and user.email:
-            self.mail_service.send_mail(
-                user.email,
-                subject=title,
-                text_body=message
-            )
+            self.outbox_repo.add_mail(title, message, to_email=user.email)
+
+        if commit:
+            db.session.commit()
+
+        return intent
+
+    def send_mail(self, to_email: str, subject: str, text_body: str, commit: bool = True):
+        self.outbox_repo.add_mail(subject, text_body, to_email=to_email)
 
-        return notif
+        if commit:
+            db.session.commit()
@@ -0,0 +1,255 @@
+import atexit
+import threading
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+class OutboxDispatcher:
+    """Drains the outbox table in batches from a background thread.
+
+    Notification intents become one multi-row INSERT per batch and their rows
+    are removed in the same commit. Mail rows are leased as ``sending`` in that
+    commit and handed to the mail queue, so no SMTP round trip happens while
+    the claimed rows are locked; each row is deleted once all its recipients
+    are sent, or retried with backoff until ``max_attempts``, after which it
+    stays in the table as ``failed``. A row whose lease runs out is claimed
+    again. With ``async_mode`` off nothing runs in the background and callers
+    (tests) invoke ``drain()`` themselves.
+    """
+
+    def __init__(self, batch_size=100, poll_seconds=5.0, max_attempts=5,
+                 backoff_seconds=30, send_lease_seconds=300, async_mode=True):
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.send_lease_seconds = send_lease_seconds
+        self.async_mode = async_mode
+        self.dispatched = 0
+        self.failed_attempts = 0
+        self._app = None
+        self._mail_service = None
+        self._sending = {}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._drain_lock = threading.Lock()
+
+    def configure(self, app, batch_size=None, poll_seconds=None, max_attempts=None,
+                  backoff_seconds=None, send_lease_seconds=None, async_mode=None):
+        self._app = app
+        if batch_size is not None:
+            self.batch_size = batch_size
+        if poll_seconds is not None:
+            self.poll_seconds = poll_seconds
+        if max_attempts is not None:
+            self.max_attempts = max_attempts
+        if backoff_seconds is not None:
+            self.backoff_seconds = backoff_seconds
+        if send_lease_seconds is not None:
+            self.send_lease_seconds = send_lease_seconds
+        if async_mode is not None:
+            self.async_mode = async_mode
+
+    @property
+    def mail_service(self):
+        if self._mail_service is None:
+            from app.utils.mail_service import MailService
+            self._mail_service = MailService()
+        return self._mail_service
+
+    def wake(self):
+        if not self.async_mode or self._app is None:
+            return
+        self._ensure_worker()
+        self._wake.set()
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="outbox-dispatcher", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
+            try:
+                with self._app.app_context():
+                    self.drain()
+            except Exception as e:
+                print("OUTBOX DISPATCH ERROR:", e)
+
+    def drain(self):
+        """Dispatch every message that is due; returns how many were handled."""
+        total = 0
+        with self._drain_lock:
+            while True:
+                handled = self._dispatch_batch()
+                total += handled
+                if handled < self.batch_size:
+                    return total
+
+    def _dispatch_batch(self):
+        from flask import current_app
+        from app.db.db import db
+        from app.repo.outbox_repo import OutboxRepo, recipient_ids
+
+        repo = OutboxRepo()
+        try:
+            messages = repo.claim_batch(self.batch_size)
+            if not messages:
+                db.session.commit()
+                return 0
+
+            notifications = [m for m in messages if m.kind == "notification"]
+            mails = [m for m in messages if m.kind == "mail"]
+
+            created = repo.insert_notifications([m.payload for m in notifications])
+
+            # one lookup resolves the addresses for the whole batch
+            emails = repo.get_emails({
+                user_id for m in mails if not m.payload.get("to_email")
+                for user_id in recipient_ids(m.payload)
+            })
+
+            sends = []
+            for m in mails:
+                if m.payload.get("to_email"):
+                    targets = [(None, m.payload["to_email"])]
+                else:
+                    # recipients without an address are skipped
+                    targets = [
+                        (user_id, emails[user_id])
+                        for user_id in recipient_ids(m.payload) if emails.get(user_id)
+                    ]
+                sends.append((m.id, m.payload["subject"], m.payload["body"], targets))
+
+            delivered = [m.id for m in notifications]
+            delivered += [message_id for message_id, _, _, targets in sends if not targets]
+            repo.mark_sending([m for m in mails if m.id not in delivered], self.send_lease_seconds)
+            repo.finish_batch(delivered)
+
+        except Exception:
+            db.session.rollback()
+            raise
+
+        self.dispatched += len(delivered)
+        self._publish(created)
+
+        app = current_app._get_current_object()
+        for message_id, subject, body, targets in sends:
+            if targets:
+                self._send(app, message_id, subject, body, targets)
+        return len(messages)
+
+    def _send(self, app, message_id, subject, body, targets):
+        with self._lock:
+            self._sending[message_id] = {"left": len(targets), "failed": [], "error": None}
+
+        for user_id, to_email in targets:
+            def on_done(ok, error, user_id=user_id):
+                self._mail_done(app, message_id, user_id, ok, error)
+
+            self.mail_service.send_mail(to_email, subject, body, on_done=on_done)
+
+    def _mail_done(self, app, message_id, user_id, ok, error):
+        """Runs on the mail worker once a recipient has a final outcome."""
+        with self._lock:
+            state = self._sending.get(message_id)
+            if state is None:
+                return
+            state["left"] -= 1
+            if not ok:
+                state["failed"].append(user_id)
+                state["error"] = error
+            if state["left"]:
+                return
+            del self._sending[message_id]
+
+        try:
+            with app.app_context():
+                self._finish_mail(message_id, state["failed"], state["error"])
+        except Exception as e:
+            print("OUTBOX DISPATCH ERROR:", e)
+
+    def _finish_mail(self, message_id, failed, error):
+        from app.db.db import db
+        from app.repo.outbox_repo import OutboxRepo
+
+        repo = OutboxRepo()
+        try:
+            message = repo.get(message_id)
+            if message is None or message.status != "sending":
+                db.session.commit()
+                return
+
+            if not failed:
+                repo.finish_batch([message_id])
+                self.dispatched += 1
+                return
+
+            self.failed_attempts += 1
+            repo.retry_later(
+                message, error, self.backoff_seconds, self.max_attempts,
+                failed_user_ids=[u for u in failed if u is not None]
+            )
+            repo.finish_batch([])
+
+        except Exception:
+            db.session.rollback()
+            raise
+
+    def _publish(self, created):
+        from app.utils.notification_hub import notification_hub
+
+        for row in created:
+            event = {"id": row["id"], **row}
+            event["created_at"] = row["created_at"].isoformat()
+            notification_hub.publish([row["user_id"]], event)
+
+    def stats(self):
+        from app.repo.outbox_repo import OutboxRepo
+        return {
+            "dispatched": self.dispatched,
+            "failed_attempts": self.failed_attempts,
+            "by_status": OutboxRepo().count_by_status(),
+        }
+
+    def stop(self):
+        """Stop the background thread and deliver whatever is already due."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join()
+        self._thread = None
+        if self._app is not None and self.async_mode:
+            try:
+                with self._app.app_context():
+                    self.drain()
+            except Exception as e:
+                print("OUTBOX DISPATCH ERROR:", e)
+
+
+outbox_dispatcher = OutboxDispatcher()
+atexit.register(outbox_dispatcher.stop)
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_dispatcher(session):
+    # savepoint releases fire this too; wait for the outer commit
+    root = session.get_transaction()
+    if root is not None and root.is_active:
+        return
+    if session.info.pop("outbox_pending", False):
+        outbox_dispatcher.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_pending(session):
+    session.info.pop("outbox_pending", None)
@@ -0,0 +1,69 @@
+import itertools
+from tempfile import SpooledTemporaryFile
+
+from app.db.csv_ex import SPOOL_MAX_BYTES, bundle_parts
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency, only needed for Parquet exports
+    pa = pq = None
+
+# rows per record batch / row group
+PARQUET_CHUNK_ROWS = 10000
+
+# ReportColumn kind -> pyarrow type factory
+PARQUET_KIND_TYPES = {"int": "int64", "float": "float64", "string": "string", "bool": "bool_"}
+
+
+def parquet_available():
+    return pq is not None
+
+
+class StreamingParquetWriter:
+    """Parquet export with the StreamingExcelWriter interface, written one
+    record batch at a time; several sheets are zipped."""
+
+    extension = "parquet"
+    mimetype = "application/vnd.apache.parquet"
+    multi_part = True
+
+    def __init__(self, progress=None):
+        if not parquet_available():
+            raise ValueError("Parquet export requires pyarrow")
+        self.progress = progress
+        self.rows_written = 0
+        self.parts = []
+
+    def _schema(self, columns, kinds):
+        if not kinds or len(kinds) != len(columns):
+            raise ValueError("Parquet export needs a declared kind for every column")
+        unknown = set(kinds) - set(PARQUET_KIND_TYPES)
+        if unknown:
+            raise ValueError(f"Unsupported column kind(s) for Parquet: {sorted(unknown)}")
+        return pa.schema([pa.field(n, getattr(pa, PARQUET_KIND_TYPES[k])()) for n, k in zip(columns, kinds)])
+
+    def add_sheet(self, name, title, columns, rows, kinds=None, **_):
+        """`kinds` ("int", "float", "string", "bool" per column) is required:
+        the schema is declared up front, never inferred from the data, so an
+        all-NULL first batch cannot fix a column to the wrong type."""
+        schema = self._schema(columns, kinds)
+        part = SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+        writer = pq.ParquetWriter(part, schema)
+
+        rows = iter(rows)
+        while True:
+            chunk = list(itertools.islice(rows, PARQUET_CHUNK_ROWS))
+            if not chunk:
+                break
+            arrays = [pa.array(values, type=field.type) for values, field in zip(zip(*chunk), schema)]
+            writer.write_batch(pa.record_batch(arrays, schema=schema))
+            self.rows_written += len(chunk)
+            if self.progress:
+                self.progress(self.rows_written)
+
+        writer.close()
+        self.parts.append((name, part))
+
+    def finish(self, path=None):
+        return bundle_parts(self.parts, self.extension, path)
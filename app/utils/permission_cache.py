@@ -0,0 +1,70 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class PermissionCache:
+    """In-process LRU cache of permission codes keyed by
+    ``(role_id, permissions_version)``.
+
+    The version comes from the role row loaded with the request principal
+    and is bumped in the same transaction as any grant change, so every
+    worker stops using the old entry on its next request. Entries also
+    expire after ``ttl_seconds``; superseded versions simply age out.
+    """
+
+    def __init__(self, ttl_seconds=300, max_size=256):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def configure(self, ttl_seconds=None, max_size=None):
+        with self._lock:
+            if ttl_seconds is not None:
+                self.ttl_seconds = ttl_seconds
+            if max_size is not None:
+                self.max_size = max_size
+            self._entries.clear()
+
+    def get(self, role_id, version):
+        key = (role_id, version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                codes, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return codes
+                del self._entries[key]
+
+            self.misses += 1
+            return None
+
+    def put(self, role_id, version, codes):
+        key = (role_id, version)
+        with self._lock:
+            self._entries[key] = (codes, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0,
+            }
+
+
+permission_cache = PermissionCache()
+
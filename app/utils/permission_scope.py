@@ -0,0 +1,20 @@
+from flask import g, has_app_context
+
+
+def set_token_scope(user_id, codes):
+    g.token_scope = (user_id, frozenset(codes or []))
+
+
+def clear_token_scope():
+    g.token_scope = None
+
+
+def get_token_scope(user_id):
+    """Permission codes taken from the verified access token, if trusted for this request."""
+    if not has_app_context():
+        return None
+
+    scope = g.get("token_scope")
+    if scope and scope[0] == user_id:
+        return scope[1]
+    return None
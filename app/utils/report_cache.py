@@ -0,0 +1,137 @@
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+
+def _normalize(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    if not value:
+        return None
+    try:
+        # "2025-01-01" and "2025-01-01T00:00:00" select the same rows
+        return datetime.fromisoformat(value).isoformat()
+    except ValueError:
+        return value
+
+
+def filter_key(kind, from_date=None, to_date=None, major=None, status=None):
+    return (kind, _normalize(from_date), _normalize(to_date), _normalize(major), _normalize(status))
+
+
+class ReportResultCache:
+    """In-process LRU of report results keyed by the normalized filter set.
+
+    Bounded by entry count and by an approximate byte budget (size of the
+    JSON encoding). The data version lives in the report_data_version row:
+    intern / project / feedback writes (and mart refreshes, from any
+    process) bump it, and every lookup reads it first, dropping this
+    worker's entries once it moved. A hit therefore still costs that one
+    primary-key read; writes made outside the repos (raw SQL, other
+    applications) are not seen until the next bump.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=8 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def configure(self, max_entries=None, max_bytes=None):
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            self._clear()
+
+    def _clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def _sync_version(self, version):
+        # caller holds the lock
+        if version != self.version:
+            self.version = version
+            self._clear()
+
+    def get_or_build(self, key, builder):
+        from app.repo.report_version_repo import ReportVersionRepo
+
+        shared = ReportVersionRepo().current()
+        with self._lock:
+            self._sync_version(shared)
+            entry = self._entries.get(key)
+            if entry:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+            self.misses += 1
+            version = self.version
+
+        value = builder()
+        self._put(key, value, version)
+        return value
+
+    def _put(self, key, value, version):
+        size = len(json.dumps(value, default=str))
+
+        with self._lock:
+            # built before an invalidation -> may already be stale
+            if version != self.version or size > self.max_bytes:
+                return
+
+            old = self._entries.pop(key, None)
+            if old:
+                self._bytes -= old[1]
+
+            self._entries[key] = (value, size)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+    def bump_version(self):
+        from app.repo.report_version_repo import ReportVersionRepo
+
+        try:
+            version = ReportVersionRepo().bump()
+        except Exception as e:
+            # the write itself is already committed
+            print("REPORT CACHE ERROR:", e)
+            with self._lock:
+                self._clear()
+            return self.version
+
+        with self._lock:
+            self._sync_version(version)
+            return self.version
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "version": self.version,
+                "size": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0,
+            }
+
+
+report_cache = ReportResultCache()
+
+
+def bump_report_data_version():
+    return report_cache.bump_version()
@@ -0,0 +1,103 @@
+import threading
+import time
+from datetime import datetime, timezone
+
+from app.utils.report_cache import bump_report_data_version
+
+
+class ReportMartRefresher:
+    """Folds the days marked dirty by intern / project / feedback writes into
+    the mart_* fact tables, ``batch_size`` markers per transaction.
+
+    Writes only mark days while ``enabled`` is on. Only the touched days
+    are recomputed; ``rebuild()`` recomputes
+    everything and is meant for the initial backfill. Each batch runs under
+    a database-wide advisory lock, so a run that finds another process
+    refreshing simply stops. With ``serve_statistics`` on, ReportUC answers
+    statistics from the mart.
+    """
+
+    def __init__(self, enabled=False, refresh_seconds=60, batch_size=500, serve_statistics=False):
+        self.enabled = enabled
+        self.refresh_seconds = refresh_seconds
+        self.batch_size = batch_size
+        self.serve_statistics = serve_statistics
+        self.last_report = None
+        self._app = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def configure(self, **options):
+        for key, value in options.items():
+            if value is not None:
+                setattr(self, key, value)
+
+    def run_once(self):
+        from app.db.db import db
+        from app.repo.report_mart_repo import ReportMartRepo
+
+        repo = ReportMartRepo()
+        started = time.monotonic()
+        markers, days, busy = 0, 0, False
+
+        with self._refresh_lock:
+            while True:
+                if not repo.lock():
+                    busy = True
+                    db.session.rollback()
+                    break
+                ids, dirty = repo.claim_dirty(self.batch_size)
+                if not ids:
+                    db.session.rollback()
+                    break
+
+                for fact, fact_days in dirty.items():
+                    repo.refresh(fact, fact_days)
+                    days += len(fact_days)
+                repo.finish_batch(ids)
+                markers += len(ids)
+
+        if markers:
+            bump_report_data_version()
+
+        report = {
+            "markers": markers,
+            "days_refreshed": days,
+            "skipped_busy": busy,
+            "seconds": round(time.monotonic() - started, 2),
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+        }
+        self.last_report = report
+        return report
+
+    def rebuild(self):
+        from app.repo.report_mart_repo import ReportMartRepo
+
+        with self._refresh_lock:
+            ReportMartRepo().rebuild()
+        bump_report_data_version()
+
+    def start(self, app):
+        self._app = app
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="report-mart", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.refresh_seconds):
+            try:
+                with self._app.app_context():
+                    self.run_once()
+            except Exception as e:
+                print("REPORT MART ERROR:", e)
+
+    def stop(self):
+        self._stop.set()
+
+
+report_mart = ReportMartRefresher()
@@ -7,12 +7,21 @@ def _secret():
     return current_app.config.get("SECRET_KEY", "dev-secret-key")
 
 
-def create_access_token(user_id, username, permissions, expires_in_minutes=30):
+def create_access_token(
+    user_id,
+    username,
+    permissions,
+    expires_in_minutes=30,
+    role_id=None,
+    permissions_version=None,
+):
     now = datetime.now(timezone.utc)
     payload = {
         "sub": str(user_id),
         "username": username,
         "permissions": permissions,
+        "rid": role_id,
+        "pv": permissions_version,
         "type": "access",
         "iat": int(now.timestamp()),
         "exp": int((now + timedelta(minutes=expires_in_minutes)).timestamp())
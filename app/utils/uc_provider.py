@@ -20,7 +20,6 @@ from app.repo.intern_project_repo import InternProjectRepo
 from app.repo.training_plan_repo import TrainingPlanRepo
 from app.repo.activitylog_repo import ActivityLogRepo
 from app.repo.notification_repo import NotificationRepo
-from app.utils.mail_service import MailService
 
 def provide_user_uc():
     return UserUC(
@@ -54,9 +53,7 @@ def provide_feedback_uc():
         intern_repo=InternRepo(),
         project_repo=ProjectRepo(),
         user_repo=UserRepo(),
-        mail_service=MailService(),
         permission_repo=PermissionRepo()
-
     )
 
 
@@ -65,8 +62,7 @@ def provide_intern_uc():
         intern_repo=InternRepo(),
         user_repo=UserRepo(),
         permission_repo=PermissionRepo(),
-        activitylog_uc=ActivityLogUC(),
-        mail_service=MailService()
+        activitylog_uc=ActivityLogUC()
     )
 
 
@@ -107,8 +103,7 @@ def provide_auth_uc():
     return AuthUC(
         user_repo=UserRepo(),
         permission_repo=PermissionRepo(),
-        activitylog_uc=ActivityLogUC(),
-        mail_service=MailService()
+        activitylog_uc=ActivityLogUC()
     )
 
 
@@ -46,6 +46,7 @@ def dashboard():
         intern_performance=data["intern_performance"],
         project_quality=data["project_quality"],
         activity_logs=data["activity_logs"],
+        snapshot_age=data["snapshot_age"],
     )
 
 @web_bp.route("/interns")
@@ -1,8 +1,11 @@
 from flask import Flask, jsonify, g , request
 from app.db.db import db
 from app.db.init_models import load_models    
-from app.utils.token_service import decode_access_token
-from app.repo.user_repo import UserRepo
+from app.utils.auth_middleware import (
+    clear_principal,
+    resolve_principal,
+    get_auth_query_count,
+)
 
 from app.api.inter_controller import intern_bp
 from app.api.project_controller import project_bp
@@ -16,10 +19,21 @@ from app.api.training_plan_controller import training_plan_bp
 from app.api.auth_controller import auth_bp
 from app.api.notification_controller import notif_bp
 from app.api.activitylog_controller import log_bp
+from app.api.mail_controller import mail_bp
 
 from app.web.view import web_bp
 from app.models.user import User
 from app.utils.exception import AppException
+from app.utils.permission_cache import permission_cache
+from app.utils.dashboard_cache import dashboard_cache
+from app.utils.activity_log_writer import activity_log_writer
+from app.utils.mail_queue import mail_queue
+from app.utils.outbox_dispatcher import outbox_dispatcher
+from app.utils.notification_hub import notification_hub
+from app.utils.retention import retention_job, retention_scheduler
+from app.utils.export_jobs import export_jobs
+from app.utils.report_cache import report_cache
+from app.utils.report_mart import report_mart
 
 
 def create_app():
@@ -34,9 +48,123 @@ def create_app():
     app.config["MAIL_USERNAME"] = "your_email@gmail.com"
     app.config["MAIL_PASSWORD"] = "your_app_password"
     app.config["MAIL_FROM"] = "Mini ERP <your_email@gmail.com>"
+    # set MAIL_ASYNC to False for tests to send inline without retries
+    app.config["MAIL_ASYNC"] = True
+    app.config["MAIL_WORKERS"] = 2
+    app.config["MAIL_MAX_RETRIES"] = 3
+    app.config["MAIL_RETRY_BACKOFF_SECONDS"] = 2
+    # set OUTBOX_ASYNC to False for tests and call outbox_dispatcher.drain()
+    app.config["OUTBOX_ASYNC"] = True
+    app.config["OUTBOX_BATCH_SIZE"] = 100
+    app.config["OUTBOX_POLL_SECONDS"] = 5
+    app.config["OUTBOX_MAX_ATTEMPTS"] = 5
+    app.config["OUTBOX_RETRY_BACKOFF_SECONDS"] = 30
+    # covers the mail queue's own retries; a lost send is claimed again after it
+    app.config["OUTBOX_SEND_LEASE_SECONDS"] = 300
+    app.config["NOTIFICATION_STREAM_MAX_CONNECTIONS"] = 200
+    app.config["NOTIFICATION_STREAM_HEARTBEAT_SECONDS"] = 15
+    # live events only reach streams on the worker that dispatched them;
+    # streams poll for the rest. 0 disables polling: single worker only
+    app.config["NOTIFICATION_STREAM_POLL_SECONDS"] = 5
+    # off by default: every worker would run its own copy; schedule
+    # scripts/run_retention.py from cron instead
+    app.config["RETENTION_ENABLED"] = False
+    app.config["RETENTION_INTERVAL_HOURS"] = 24
+    app.config["RETENTION_NOTIFICATION_DAYS"] = 30
+    app.config["RETENTION_ACTIVITY_LOG_DAYS"] = 180
+    app.config["RETENTION_BATCH_SIZE"] = 1000
+    app.config["RETENTION_BATCH_PAUSE_SECONDS"] = 0.2
+    app.config["RETENTION_MAX_SECONDS"] = 300
+    app.config["REPORT_CACHE_MAX_ENTRIES"] = 256
+    app.config["REPORT_CACHE_MAX_BYTES"] = 8 * 1024 * 1024
+    # writes mark mart days dirty only while this is on; run
+    # scripts/refresh_report_mart.py --rebuild once after turning it on
+    app.config["REPORT_MART_ENABLED"] = False
+    # off by default: drive the refresh from cron with
+    # scripts/refresh_report_mart.py instead of a thread per worker
+    app.config["REPORT_MART_REFRESH_IN_PROCESS"] = False
+    app.config["REPORT_MART_REFRESH_SECONDS"] = 60
+    app.config["REPORT_MART_BATCH_SIZE"] = 500
+    # only honoured with REPORT_MART_ENABLED on
+    app.config["REPORT_STATS_FROM_MART"] = False
+    app.config["EXPORT_JOB_WORKERS"] = 2
+    # must be shared by every worker process; defaults to <tmp>/mini_erp_exports
+    app.config["EXPORT_JOB_DIR"] = None
+    app.config["EXPORT_JOB_TTL_SECONDS"] = 3600
+
+    app.config["PERMISSION_CACHE_TTL"] = 300
+    app.config["PERMISSION_CACHE_SIZE"] = 256
+    # opt-in: answer permission checks from the (version-checked) JWT claims
+    app.config["TRUST_TOKEN_PERMISSIONS"] = False
+    app.config["DASHBOARD_REFRESH_SECONDS"] = 60
+    app.config["DASHBOARD_INVALIDATE_ON_WRITE"] = True
+    # set to False for tests to write each log entry synchronously
+    app.config["ACTIVITY_LOG_ASYNC"] = True
+    app.config["ACTIVITY_LOG_BATCH_SIZE"] = 100
+    app.config["ACTIVITY_LOG_FLUSH_SECONDS"] = 2
 
     db.init_app(app)
 
+    permission_cache.configure(
+        ttl_seconds=app.config["PERMISSION_CACHE_TTL"],
+        max_size=app.config["PERMISSION_CACHE_SIZE"],
+    )
+    dashboard_cache.configure(
+        refresh_seconds=app.config["DASHBOARD_REFRESH_SECONDS"],
+        invalidate_on_write=app.config["DASHBOARD_INVALIDATE_ON_WRITE"],
+    )
+    activity_log_writer.configure(
+        app,
+        batch_size=app.config["ACTIVITY_LOG_BATCH_SIZE"],
+        flush_seconds=app.config["ACTIVITY_LOG_FLUSH_SECONDS"],
+        async_mode=app.config["ACTIVITY_LOG_ASYNC"],
+    )
+    mail_queue.configure(
+        workers=app.config["MAIL_WORKERS"],
+        max_retries=app.config["MAIL_MAX_RETRIES"],
+        backoff_seconds=app.config["MAIL_RETRY_BACKOFF_SECONDS"],
+        async_mode=app.config["MAIL_ASYNC"],
+    )
+    outbox_dispatcher.configure(
+        app,
+        batch_size=app.config["OUTBOX_BATCH_SIZE"],
+        poll_seconds=app.config["OUTBOX_POLL_SECONDS"],
+        max_attempts=app.config["OUTBOX_MAX_ATTEMPTS"],
+        backoff_seconds=app.config["OUTBOX_RETRY_BACKOFF_SECONDS"],
+        send_lease_seconds=app.config["OUTBOX_SEND_LEASE_SECONDS"],
+        async_mode=app.config["OUTBOX_ASYNC"],
+    )
+    notification_hub.configure(
+        max_connections=app.config["NOTIFICATION_STREAM_MAX_CONNECTIONS"],
+    )
+    retention_job.configure(
+        notification_days=app.config["RETENTION_NOTIFICATION_DAYS"],
+        activity_log_days=app.config["RETENTION_ACTIVITY_LOG_DAYS"],
+        batch_size=app.config["RETENTION_BATCH_SIZE"],
+        pause_seconds=app.config["RETENTION_BATCH_PAUSE_SECONDS"],
+        max_seconds=app.config["RETENTION_MAX_SECONDS"],
+    )
+    report_cache.configure(
+        max_entries=app.config["REPORT_CACHE_MAX_ENTRIES"],
+        max_bytes=app.config["REPORT_CACHE_MAX_BYTES"],
+    )
+    report_mart.configure(
+        enabled=app.config["REPORT_MART_ENABLED"],
+        refresh_seconds=app.config["REPORT_MART_REFRESH_SECONDS"],
+        batch_size=app.config["REPORT_MART_BATCH_SIZE"],
+        serve_statistics=app.config["REPORT_MART_ENABLED"] and app.config["REPORT_STATS_FROM_MART"],
+    )
+    if app.config["REPORT_MART_ENABLED"] and app.config["REPORT_MART_REFRESH_IN_PROCESS"]:
+        report_mart.start(app)
+    export_jobs.configure(
+        app,
+        workers=app.config["EXPORT_JOB_WORKERS"],
+        directory=app.config["EXPORT_JOB_DIR"],
+        ttl_seconds=app.config["EXPORT_JOB_TTL_SECONDS"],
+    )
+    if app.config["RETENTION_ENABLED"]:
+        retention_scheduler.start(app, app.config["RETENTION_INTERVAL_HOURS"])
+
     app.register_blueprint(intern_bp)
     app.register_blueprint(project_bp)
     app.register_blueprint(intern_project_bp)
@@ -50,38 +178,21 @@ def create_app():
     app.register_blueprint(auth_bp)
     app.register_blueprint(notif_bp)
     app.register_blueprint(log_bp)
-
-    
-    user_repo = UserRepo()
+    app.register_blueprint(mail_bp)
 
     @app.before_request
     def load_current_user():
-        g.current_user = None
-        g.current_permissions = []
-
-        token = None
-
-        auth_header = request.headers.get("Authorization", "")
-        if auth_header.startswith("Bearer "):
-            token = auth_header.split(" ", 1)[1].strip()
-
-        if not token:
-            token = request.cookies.get("access_token")
-
-        if not token:
-            return 
-
+        clear_principal()
         try:
-            payload = decode_access_token(token)
-            user = user_repo.get_by_id(payload.get("sub"))
-
-            g.current_user = user
-            g.current_permissions = payload.get("permissions", [])
-
+            resolve_principal()
         except Exception:
-            g.current_user = None
-            g.current_permissions = []
+            pass
 
+    @app.after_request
+    def expose_auth_query_count(response):
+        if app.debug:
+            response.headers["X-Auth-Queries"] = str(get_auth_query_count())
+        return response
 
     @app.context_processor
     def inject_permissions():
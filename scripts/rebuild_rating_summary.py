@@ -0,0 +1,15 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.db.db import db
+from app.repo.rating_summary_repo import RatingSummaryRepo
+
+app = create_app()
+
+with app.app_context():
+    print("🧮 Rebuilding rating summary tables...")
+    db.create_all()
+    rows = RatingSummaryRepo().rebuild()
+    print(f"✅ Rebuilt {rows} summary rows from feedbacks")
@@ -0,0 +1,23 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.db.db import db
+from app.utils.report_mart import report_mart
+
+app = create_app()
+
+with app.app_context():
+    db.create_all()
+    if "--rebuild" in sys.argv:
+        print("🧮 Rebuilding reporting mart from the source tables...")
+        report_mart.rebuild()
+        print("✅ Reporting mart rebuilt")
+    else:
+        print("🔄 Refreshing dirty days in the reporting mart...")
+        report = report_mart.run_once()
+        if report["skipped_busy"]:
+            print("⏭️ Another process is refreshing the mart, stopped early")
+        print(f"✅ {report['days_refreshed']} days refreshed from {report['markers']} markers "
+              f"in {report['seconds']}s")
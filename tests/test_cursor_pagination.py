@@ -0,0 +1,115 @@
+import os, sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime, timedelta, timezone
+
+from app import create_app, db
+from app.models.user import User
+from app.models.activitylog import ActivityLog
+from app.models.notification import Notification
+from app.repo.activitylog_repo import ActivityLogRepo
+from app.usecase.activitylog_uc import ActivityLogUC
+from app.usecase.notification_uc import NotificationUC
+from app.utils.exception import BadRequest
+
+
+def walk(fetch_page):
+    """Follow next_cursor until the last page; returns every id seen."""
+    ids, cursor, pages = [], None, 0
+    while True:
+        page = fetch_page(cursor)
+        ids.extend(item["id"] for item in page["items"])
+        pages += 1
+        cursor = page["next_cursor"]
+        if not cursor:
+            return ids, pages
+
+
+app = create_app()
+
+with app.app_context():
+    print("Start testing cursor pagination")
+
+    db.drop_all()
+    db.create_all()
+    print("Database reset done")
+
+    user = User(username="reader", email="reader@example.com", password_hash="x")
+    other = User(username="other", email="other@example.com", password_hash="x")
+    db.session.add_all([user, other])
+    db.session.commit()
+
+    # groups of rows share a timestamp, so pages must break ties on id
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    entries = [
+        {
+            "user_id": user.id if i % 4 else other.id,
+            "action": "LOGIN" if i % 2 else "UPDATE",
+            "details": f"entry {i}",
+            "timestamp": base + timedelta(minutes=i // 3),
+        }
+        for i in range(23)
+    ]
+    ActivityLogRepo().bulk_insert(entries)
+    print("Inserted", len(entries), "activity logs")
+
+    logs = ActivityLogUC()
+    expected = [
+        log.id for log in
+        ActivityLog.query.order_by(ActivityLog.timestamp.desc(), ActivityLog.id.desc()).all()
+    ]
+    ids, pages = walk(lambda cursor: logs.list_logs({}, cursor, 5))
+    assert ids == expected, (ids, expected)
+    assert pages == 5
+    print("Activity log pages:", pages, "rows:", len(ids))
+
+    filters = logs.parse_filters({"user_id": str(user.id), "action": "LOGIN"})
+    expected = [
+        log.id for log in
+        ActivityLog.query.filter_by(user_id=user.id, action="LOGIN")
+        .order_by(ActivityLog.timestamp.desc(), ActivityLog.id.desc()).all()
+    ]
+    ids, _ = walk(lambda cursor: logs.list_logs(filters, cursor, 2))
+    assert ids == expected, (ids, expected)
+    print("Filtered activity log rows:", len(ids))
+
+    same_time = datetime(2025, 2, 1)
+    notifications = [
+        Notification(
+            user_id=user.id, title=f"N{i}", message="hello",
+            is_read=i % 3 == 0, created_at=same_time + timedelta(seconds=i // 4)
+        )
+        for i in range(17)
+    ]
+    notifications.append(Notification(user_id=other.id, title="other", message="hello", created_at=same_time))
+    db.session.add_all(notifications)
+    db.session.commit()
+    print("Inserted", len(notifications), "notifications")
+
+    notif_uc = NotificationUC()
+    expected = [
+        n.id for n in
+        Notification.query.filter_by(user_id=user.id)
+        .order_by(Notification.created_at.desc(), Notification.id.desc()).all()
+    ]
+    ids, pages = walk(lambda cursor: notif_uc.list_for_user(user.id, cursor=cursor, limit=4))
+    assert ids == expected, (ids, expected)
+    assert pages == 5
+    print("Notification pages:", pages, "rows:", len(ids))
+
+    expected = [
+        n.id for n in
+        Notification.query.filter_by(user_id=user.id, is_read=False)
+        .order_by(Notification.created_at.desc(), Notification.id.desc()).all()
+    ]
+    ids, _ = walk(lambda cursor: notif_uc.list_for_user(user.id, True, cursor, 3))
+    assert ids == expected, (ids, expected)
+    print("Unread notification rows:", len(ids))
+
+    try:
+        notif_uc.list_for_user(user.id, cursor="not-a-cursor")
+        raise AssertionError("invalid cursor accepted")
+    except BadRequest:
+        print("Invalid cursor rejected")
+
+    print("\nAll cursor pagination tests passed successfully!")
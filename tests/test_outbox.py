@@ -0,0 +1,97 @@
+import os, sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime, timedelta
+
+from app import create_app, db
+from app.models.user import User
+from app.models.outbox import OutboxMessage
+from app.repo.outbox_repo import OutboxRepo
+from app.utils.outbox_dispatcher import OutboxDispatcher
+
+
+def claimed_ids(repo):
+    ids = [m.id for m in repo.claim_batch(10)]
+    db.session.rollback()
+    return ids
+
+
+def expire(message_id):
+    """Pretend the lease / backoff of a message ran out."""
+    message = db.session.get(OutboxMessage, message_id)
+    message.available_at = datetime.utcnow() - timedelta(seconds=1)
+    db.session.commit()
+
+
+app = create_app()
+
+with app.app_context():
+    print("Start testing outbox retry and lease")
+
+    db.drop_all()
+    db.create_all()
+    print("Database reset done")
+
+    alice = User(username="alice", email="alice@example.com", password_hash="x")
+    bob = User(username="bob", email="bob@example.com", password_hash="x")
+    db.session.add_all([alice, bob])
+    db.session.commit()
+
+    repo = OutboxRepo()
+    mail = repo.add_mail("Subject", "Body", user_ids=[alice.id, bob.id])
+    db.session.commit()
+    mail_id = mail.id
+    assert claimed_ids(repo) == [mail_id]
+    print("Pending mail claimed")
+
+    # the dispatcher leases the row before the claim commits
+    batch = repo.claim_batch(10)
+    repo.mark_sending(batch, lease_seconds=300)
+    repo.finish_batch([])
+    assert db.session.get(OutboxMessage, mail_id).status == "sending"
+    assert claimed_ids(repo) == []
+    print("Leased mail is not claimed again")
+
+    # a worker that died mid-send leaves the row behind until the lease ends
+    expire(mail_id)
+    assert claimed_ids(repo) == [mail_id]
+    print("Expired lease is reclaimed")
+
+    dispatcher = OutboxDispatcher(max_attempts=2, backoff_seconds=60)
+    dispatcher._finish_mail(mail_id, [bob.id], "smtp down")
+    message = db.session.get(OutboxMessage, mail_id)
+    assert message.status == "pending" and message.attempts == 1
+    assert message.payload["user_ids"] == [bob.id]
+    assert message.available_at > datetime.utcnow() + timedelta(seconds=30)
+    assert claimed_ids(repo) == []
+    print("Failed recipient retried later:", message.payload["user_ids"])
+
+    # an outcome for a row that is no longer leased is ignored
+    dispatcher._finish_mail(mail_id, [], None)
+    assert db.session.get(OutboxMessage, mail_id) is not None
+    print("Outcome without a lease ignored")
+
+    expire(mail_id)
+    batch = repo.claim_batch(10)
+    repo.mark_sending(batch, lease_seconds=300)
+    repo.finish_batch([])
+    dispatcher._finish_mail(mail_id, [bob.id], "smtp down again")
+    message = db.session.get(OutboxMessage, mail_id)
+    assert message.status == "failed" and message.attempts == 2
+    assert message.last_error == "smtp down again"
+    expire(mail_id)
+    assert claimed_ids(repo) == []
+    print("Mail failed after", message.attempts, "attempts")
+
+    ok = repo.add_mail("Hello", "Body", user_id=alice.id)
+    db.session.commit()
+    ok_id = ok.id
+    repo.mark_sending(repo.claim_batch(10), lease_seconds=300)
+    repo.finish_batch([])
+    dispatcher._finish_mail(ok_id, [], None)
+    assert db.session.get(OutboxMessage, ok_id) is None
+    assert dispatcher.dispatched == 1
+    print("Delivered mail removed from the outbox")
+
+    print("Outbox status:", repo.count_by_status())
+    print("\nAll outbox tests passed successfully!")
@@ -0,0 +1,84 @@
+import os, sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db
+from app.models.user import User
+from app.models.intern import Intern
+from app.models.project import Project
+from app.models.feedback import FeedbackType
+from app.models.rating_summary import InternRatingSummary, ProjectRatingSummary
+from app.repo.feedback_repo import FeedbackRepo
+
+
+def intern_summary(intern_id, feedback_type):
+    return db.session.get(InternRatingSummary, (intern_id, feedback_type))
+
+
+def project_summary(project_id, feedback_type):
+    return db.session.get(ProjectRatingSummary, (project_id, feedback_type))
+
+
+app = create_app()
+
+with app.app_context():
+    print("Start testing rating summaries")
+
+    db.drop_all()
+    db.create_all()
+    print("Database reset done")
+
+    trainer = User(username="trainer", email="trainer@example.com", password_hash="x")
+    intern = Intern(name="Intern A", email="intern.a@example.com", major="SE")
+    project = Project(title="Mini ERP", description="Rating summary test")
+    db.session.add_all([trainer, intern, project])
+    db.session.commit()
+
+    repo = FeedbackRepo()
+    trainer_intern = FeedbackType.TRAINER_INTERN.value
+    intern_project = FeedbackType.INTERN_PROJECT.value
+
+    fb1 = repo.create({
+        "type": FeedbackType.TRAINER_INTERN, "score": 8,
+        "from_user_id": trainer.id, "to_intern_id": intern.id,
+    })
+    fb2 = repo.create({
+        "type": FeedbackType.TRAINER_INTERN, "score": 6,
+        "from_user_id": trainer.id, "to_intern_id": intern.id,
+    })
+    fb3 = repo.create({
+        "type": FeedbackType.INTERN_PROJECT, "score": 4,
+        "from_user_id": trainer.id, "to_intern_id": intern.id, "to_project_id": project.id,
+    })
+
+    row = intern_summary(intern.id, trainer_intern)
+    assert (row.score_sum, row.score_count, row.histogram) == (14, 2, {"8": 1, "6": 1})
+    row = intern_summary(intern.id, intern_project)
+    assert (row.score_sum, row.score_count, row.histogram) == (4, 1, {"4": 1})
+    row = project_summary(project.id, intern_project)
+    assert (row.score_sum, row.score_count, row.histogram) == (4, 1, {"4": 1})
+    print("Summaries after create:", intern_summary(intern.id, trainer_intern).to_dict())
+
+    repo.update(fb1.id, {"score": 9})
+    row = intern_summary(intern.id, trainer_intern)
+    assert (row.score_sum, row.score_count, row.histogram) == (15, 2, {"9": 1, "6": 1})
+
+    repo.update(fb3.id, {"score": 5})
+    assert project_summary(project.id, intern_project).histogram == {"5": 1}
+    assert intern_summary(intern.id, intern_project).histogram == {"5": 1}
+    print("Summaries after update:", intern_summary(intern.id, trainer_intern).to_dict())
+
+    repo.soft_delete(fb2.id)
+    row = intern_summary(intern.id, trainer_intern)
+    assert (row.score_sum, row.score_count, row.histogram) == (9, 1, {"9": 1})
+
+    repo.soft_delete(fb3.id)
+    row = project_summary(project.id, intern_project)
+    assert (row.score_sum, row.score_count, row.histogram) == (0, 0, {})
+    print("Summaries after soft delete:", intern_summary(intern.id, trainer_intern).to_dict())
+
+    # updating a deleted feedback must not bring it back into the summary
+    repo.update(fb2.id, {"score": 10})
+    assert intern_summary(intern.id, trainer_intern).score_count == 1
+    print("Deleted feedback stays out of the summary")
+
+    print("\nAll rating summary tests passed successfully!")